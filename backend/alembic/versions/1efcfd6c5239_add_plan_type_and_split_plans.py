@@ -7,7 +7,6 @@ Create Date: 2026-01-01 13:55:23.933832
 """
 from alembic import op
 import sqlalchemy as sa
-import uuid
 
 
 # revision identifiers, used by Alembic.
@@ -24,95 +23,46 @@ def upgrade() -> None:
 
     op.add_column('plans', sa.Column('plan_type', plan_type_enum, nullable=True))
 
-    # Data migration: split existing combined plan_data into per-type rows
-    conn = op.get_bind()
-
-    plans = sa.table(
-        "plans",
-        sa.column("id", sa.String),
-        sa.column("user_id", sa.String),
-        sa.column("plan_type", sa.String),
-        sa.column("name", sa.String),
-        sa.column("start_date", sa.Date),
-        sa.column("end_date", sa.Date),
-        sa.column("duration_days", sa.Integer),
-        sa.column("plan_data", sa.JSON),
-        sa.column("is_active", sa.Boolean),
-        sa.column("is_completed", sa.Boolean),
+    # Data migration: split existing combined plan_data into per-type rows.
+    # Done server-side so the whole table is handled in two statements rather
+    # than one round-trip per row. plan_data is a JSON column, so cast to
+    # JSONB to use the key operators.
+    diet = "plan_data::jsonb -> 'diet'"
+    exercise = "plan_data::jsonb -> 'exercise'"
+
+    def _present(expr: str) -> str:
+        # Mirror Python truthiness: missing, null and empty values don't count
+        return f"COALESCE({expr}, 'null'::jsonb) NOT IN ('null', 'false', '0', '\"\"', '[]', '{{}}')"
+
+    # If both exist, insert a new workout plan row (the existing row becomes the meal plan below)
+    op.execute(
+        f"""
+        INSERT INTO plans (id, user_id, plan_type, name, start_date, end_date, duration_days, plan_data, is_active, is_completed)
+        SELECT gen_random_uuid()::text, user_id, 'workout', COALESCE(name, 'Plan') || ' (Workout)',
+               start_date, end_date, duration_days, ({exercise})::json, is_active, is_completed
+        FROM plans
+        WHERE plan_type IS NULL AND {_present(diet)} AND {_present(exercise)}
+        """
     )
 
-    rows = conn.execute(
-        sa.text(
-            """
-            SELECT id, user_id, name, start_date, end_date, duration_days, plan_data, is_active, is_completed
-            FROM plans
-            """
-        )
-    ).mappings().all()
-
-    for row in rows:
-        plan_id = row["id"]
-        plan_data = row["plan_data"]
-
-        # Some DBs may return JSON as string; attempt to parse if needed
-        if isinstance(plan_data, str):
-            try:
-                import json
-                plan_data = json.loads(plan_data)
-            except Exception:
-                plan_data = {}
-
-        diet = plan_data.get("diet") if isinstance(plan_data, dict) else None
-        exercise = plan_data.get("exercise") if isinstance(plan_data, dict) else None
-
-        # If both exist, reuse existing row for meal plan, insert a new workout plan row
-        if diet and exercise:
-            conn.execute(
-                sa.update(plans)
-                .where(plans.c.id == plan_id)
-                .values(plan_type="meal", plan_data=diet)
-            )
-
-            new_id = str(uuid.uuid4())
-            new_name = (row["name"] or "Plan") + " (Workout)"
-            conn.execute(
-                sa.insert(plans).values(
-                    id=new_id,
-                    user_id=row["user_id"],
-                    plan_type="workout",
-                    name=new_name,
-                    start_date=row["start_date"],
-                    end_date=row["end_date"],
-                    duration_days=row["duration_days"],
-                    plan_data=exercise,
-                    is_active=row["is_active"],
-                    is_completed=row["is_completed"],
-                )
-            )
-
-        # If only diet exists, repurpose existing row
-        elif diet:
-            conn.execute(
-                sa.update(plans)
-                .where(plans.c.id == plan_id)
-                .values(plan_type="meal", plan_data=diet)
-            )
-
-        # If only exercise exists, repurpose existing row
-        elif exercise:
-            conn.execute(
-                sa.update(plans)
-                .where(plans.c.id == plan_id)
-                .values(plan_type="workout", plan_data=exercise)
-            )
-
-        # Otherwise set a default type to satisfy NOT NULL (empty/legacy plan shell)
-        else:
-            conn.execute(
-                sa.update(plans)
-                .where(plans.c.id == plan_id)
-                .values(plan_type="meal")
-            )
+    # Repurpose every pre-existing row: diet wins, then exercise; otherwise set a
+    # default type to satisfy NOT NULL (empty/legacy plan shell)
+    op.execute(
+        f"""
+        UPDATE plans
+        SET plan_type = (CASE
+                WHEN {_present(diet)} THEN 'meal'
+                WHEN {_present(exercise)} THEN 'workout'
+                ELSE 'meal'
+            END)::plantype,
+            plan_data = (CASE
+                WHEN {_present(diet)} THEN {diet}
+                WHEN {_present(exercise)} THEN {exercise}
+                ELSE plan_data::jsonb
+            END)::json
+        WHERE plan_type IS NULL
+        """
+    )
 
     # Enforce non-null plan_type + index
     op.alter_column('plans', 'plan_type', nullable=False)
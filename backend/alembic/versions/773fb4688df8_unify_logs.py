@@ -33,9 +33,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_logs_id'), 'logs', ['id'], unique=False)
-    op.create_index(op.f('ix_logs_user_id'), 'logs', ['user_id'], unique=False)
-    op.create_index(op.f('ix_logs_log_type'), 'logs', ['log_type'], unique=False)
 
     # Migrate data from meal_logs
     op.execute("""
@@ -51,6 +48,12 @@ def upgrade() -> None:
         FROM goal_checkins
     """)
 
+    # Build secondary indexes once over the filled table rather than maintaining
+    # them row by row during the backfill
+    op.create_index(op.f('ix_logs_id'), 'logs', ['id'], unique=False)
+    op.create_index(op.f('ix_logs_user_id'), 'logs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_logs_log_type'), 'logs', ['log_type'], unique=False)
+
     # Drop old tables
     op.drop_index(op.f('ix_meal_logs_user_id'), table_name='meal_logs')
     op.drop_index(op.f('ix_meal_logs_id'), table_name='meal_logs')
@@ -0,0 +1,39 @@
+"""add active goal / plan lookup indexes
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d5e6f7a8b9c0"
+down_revision = "c4d5e6f7a8b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every state/chat request looks up the user's active goals and active plan per
+    # type. Partial on Postgres: inactive (replaced) plans and goals aren't indexed.
+    op.create_index(
+        "ix_goals_user_active",
+        "goals",
+        ["user_id", "is_active"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_plans_user_type_active",
+        "plans",
+        ["user_id", "plan_type", "is_active"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_plans_user_type_active", table_name="plans")
+    op.drop_index("ix_goals_user_active", table_name="goals")
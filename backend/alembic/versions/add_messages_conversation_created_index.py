@@ -0,0 +1,29 @@
+"""add messages (conversation_id, created_at) index
+
+Revision ID: c4d5e6f7a8b9
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+
+revision = "c4d5e6f7a8b9"
+down_revision = "b3c4d5e6f7a8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Conversation history is always read ordered by created_at (newest-first with
+    # LIMIT for chat turns); this lets Postgres walk the index instead of sorting.
+    op.create_index(
+        "ix_messages_conv_created",
+        "messages",
+        ["conversation_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_conv_created", table_name="messages")
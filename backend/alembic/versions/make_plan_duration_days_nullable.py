@@ -6,7 +6,6 @@ Create Date: 2026-02-19
 
 """
 from alembic import op
-import sqlalchemy as sa
 
 
 revision = "b3c4d5e6f7a8"
@@ -15,19 +14,17 @@ branch_labels = None
 depends_on = None
 
 
+# See a2b3c4d5e6f7: fail fast rather than stall reads behind the lock queue
+LOCK_TIMEOUT = "3s"
+
+
 def upgrade() -> None:
-    op.alter_column(
-        "plans",
-        "duration_days",
-        existing_type=sa.Integer(),
-        nullable=True,
-    )
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute("ALTER TABLE plans ALTER COLUMN duration_days DROP NOT NULL")
+    op.execute("RESET lock_timeout")
 
 
 def downgrade() -> None:
-    op.alter_column(
-        "plans",
-        "duration_days",
-        existing_type=sa.Integer(),
-        nullable=False,
-    )
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute("ALTER TABLE plans ALTER COLUMN duration_days SET NOT NULL")
+    op.execute("RESET lock_timeout")
@@ -6,7 +6,6 @@ Create Date: 2026-02-13
 
 """
 from alembic import op
-import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
@@ -16,16 +15,22 @@ branch_labels = None
 depends_on = None
 
 
+# Give up quickly instead of queueing behind long-running queries (and every
+# read that would then queue behind us) while waiting for the table lock
+LOCK_TIMEOUT = "3s"
+
+
 def upgrade() -> None:
-    # Make end_date nullable - plans are now ongoing until replaced
-    op.alter_column('plans', 'end_date',
-                    existing_type=sa.Date(),
-                    nullable=True)
+    # Make end_date nullable - plans are now ongoing until replaced.
+    # DROP NOT NULL is a catalog-only change: no table rewrite or scan.
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute("ALTER TABLE plans ALTER COLUMN end_date DROP NOT NULL")
+    op.execute("RESET lock_timeout")
 
 
 def downgrade() -> None:
     # Revert: make end_date required again
     # Note: This will fail if there are NULL values - would need to set them first
-    op.alter_column('plans', 'end_date',
-                    existing_type=sa.Date(),
-                    nullable=False)
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute("ALTER TABLE plans ALTER COLUMN end_date SET NOT NULL")
+    op.execute("RESET lock_timeout")
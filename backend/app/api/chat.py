@@ -1,43 +1,65 @@
 """Chat API endpoint."""
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+import logging
+from typing import Optional, Set
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.dao import ConversationDAO, MessageDAO
-from app.api.schemas.chat import ChatRequest, ChatResponse, MessageResponse
-from app.services.chat import ChatService
+from app.api.schemas.chat import (
+    ChatRequest,
+    ChatResponse,
+    ConversationMessagesResponse,
+    MessageResponse,
+)
+from app.services.chat import ChatService, ChatResult
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
+# Streamed turns still running; holds a reference so a turn outlives a disconnected client
+_running_turns: Set[asyncio.Future] = set()
+
 
-@router.get("/chat/conversations/{conversation_id}/messages")
-async def get_conversation_messages(
+@router.get(
+    "/chat/conversations/{conversation_id}/messages",
+    response_model=ConversationMessagesResponse,
+)
+def get_conversation_messages(
     conversation_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Return only the newest N messages"),
+    before: Optional[str] = Query(None, description="Message id; page to messages older than it"),
     db: Session = Depends(get_db),
 ):
-    """Return all messages for a conversation (for loading history)."""
+    """Return messages for a conversation (for loading history), all or a page at a time."""
     conversation_dao = ConversationDAO(db)
-    message_dao = MessageDAO(db)
-    conversation = conversation_dao.get_by_id(conversation_id)
+    if limit is not None or before is not None:
+        if not conversation_dao.get_by_id(conversation_id):
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        return ConversationMessagesResponse(
+            conversation_id=conversation_id,
+            messages=MessageDAO(db).get_recent(conversation_id, limit or 50, before_id=before),
+        )
+
+    conversation = conversation_dao.get_with_messages(conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    messages = message_dao.get_by_conversation(conversation_id)
-    return {
-        "conversation_id": conversation_id,
-        "messages": [
-            {
-                "id": m.id,
-                "role": m.role,
-                "content": m.content or "",
-                "created_at": m.created_at,
-            }
-            for m in messages
-        ],
-    }
+    # Messages validate straight from the ORM rows (from_attributes) and are
+    # serialized by pydantic-core rather than a per-row dict built in Python
+    return ConversationMessagesResponse(
+        conversation_id=conversation_id,
+        messages=conversation.messages,
+    )
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(
+def chat(
     request: ChatRequest,
     db: Session = Depends(get_db)
 ):
@@ -57,14 +79,73 @@ async def chat(
     service = ChatService(db)
     
     try:
-        result = await service.process_message(
+        # Sync endpoint: FastAPI runs it on the threadpool, so the blocking DB and
+        # Bedrock calls inside the agents no longer stall the event loop
+        result = asyncio.run(service.process_message(
             message=request.message,
             conversation_id=request.conversation_id,
             agent_type=request.agent_type
-        )
+        ))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     
+    return _chat_response(result)
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streaming variant of /chat, as server-sent events.
+    
+    Emits `delta` events ({"delta": "..."}) while a free-text agent reply is being
+    generated, then one `done` event carrying the same body /chat returns; its
+    assistant_message is authoritative (transitions may append a greeting).
+    Failures end the stream with an `error` event ({"detail": "..."}).
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit(event) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    def run() -> None:
+        # Own session rather than get_db's: the turn finishes (and commits) even if the
+        # client disconnects and the response is torn down mid-stream
+        db = SessionLocal()
+        try:
+            service = ChatService(db)
+            result = asyncio.run(service.process_message(
+                message=request.message,
+                conversation_id=request.conversation_id,
+                agent_type=request.agent_type,
+                on_delta=lambda text: emit(("delta", {"delta": text}))
+            ))
+            emit(("done", _chat_response(result).model_dump(mode="json")))
+        except ValueError as e:
+            emit(("error", {"detail": str(e)}))
+        except Exception:
+            logger.exception("Streaming chat turn failed")
+            emit(("error", {"detail": "Something went wrong. Please try again."}))
+        finally:
+            db.close()
+            emit(None)
+
+    # Same bounded threadpool sync endpoints run on, so streamed turns count against
+    # its limit (and the DB pool sized to it)
+    turn = asyncio.ensure_future(run_in_threadpool(run))
+    _running_turns.add(turn)
+    turn.add_done_callback(_running_turns.discard)
+
+    async def sse():
+        while (event := await events.get()) is not None:
+            name, data = event
+            yield f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(sse(), media_type="text/event-stream")
+
+
+def _chat_response(result: ChatResult) -> ChatResponse:
+    """Build the API response for a processed chat turn."""
     return ChatResponse(
         conversation_id=result.conversation_id,
         user_message=MessageResponse(
@@ -25,14 +25,14 @@ router = APIRouter(prefix="/api/logs", tags=["logs"])
 
 
 @router.post("/meals/parse", response_model=MealParseResponse)
-async def parse_meal(request: MealParseRequest, db: Session = Depends(get_db)) -> MealParseResponse:
+def parse_meal(request: MealParseRequest, db: Session = Depends(get_db)) -> MealParseResponse:
     service = MealLoggingService(db)
     parsed = service.parse_meal(request.text)
     return MealParseResponse(parsed=parsed)
 
 
 @router.post("/meals", response_model=MealLogResponse)
-async def create_meal_log(request: MealLogCreateRequest, db: Session = Depends(get_db)) -> MealLogResponse:
+def create_meal_log(request: MealLogCreateRequest, db: Session = Depends(get_db)) -> MealLogResponse:
     service = MealLoggingService(db)
     log = service.save_meal_log(
         raw_text=request.raw_text,
@@ -44,7 +44,7 @@ async def create_meal_log(request: MealLogCreateRequest, db: Session = Depends(g
 
 
 @router.post("/goals", response_model=GoalCheckInResponse)
-async def create_goal_checkin(
+def create_goal_checkin(
     request: GoalCheckInCreateRequest,
     db: Session = Depends(get_db),
 ) -> GoalCheckInResponse:
@@ -60,20 +60,19 @@ async def create_goal_checkin(
     )
     db.add(log)
     db.commit()
-    db.refresh(log)
 
     return GoalCheckInResponse(id=log.id, text=log.raw_text, logged_at=log.logged_at)
 
 
 @router.post("/workouts/parse", response_model=WorkoutParseResponse)
-async def parse_workout(request: WorkoutParseRequest, db: Session = Depends(get_db)) -> WorkoutParseResponse:
+def parse_workout(request: WorkoutParseRequest, db: Session = Depends(get_db)) -> WorkoutParseResponse:
     service = WorkoutLoggingService(db)
     parsed = service.parse_workout(request.text)
     return WorkoutParseResponse(parsed=parsed)
 
 
 @router.post("/workouts", response_model=WorkoutLogResponse)
-async def create_workout_log(request: WorkoutLogCreateRequest, db: Session = Depends(get_db)) -> WorkoutLogResponse:
+def create_workout_log(request: WorkoutLogCreateRequest, db: Session = Depends(get_db)) -> WorkoutLogResponse:
     service = WorkoutLoggingService(db)
     log = service.save_workout_log(
         raw_text=request.raw_text,
@@ -1,4 +1,7 @@
 """Deterministic plan generation and view endpoints (non-chat)."""
+import asyncio
+import threading
+from collections import OrderedDict
 from datetime import date
 from typing import Optional
 
@@ -15,55 +18,57 @@ from app.api.schemas.plans import (
     PlanViewResponse,
 )
 from app.models.plan import PlanType
-from app.services.nutritionist.planning import MealPlanData
-from app.services.trainer.planning import WorkoutPlanData
 from app.services.nutritionist import NutritionService
 from app.services.trainer import TrainingService
 
 router = APIRouter(prefix="/api/plans", tags=["plans"])
 
+# Rendered day views, keyed by (plan_id, updated_at, date, include_detail). Any write to
+# a plan bumps updated_at, so an entry is never served stale; superseded keys age out.
+_VIEW_CACHE_SIZE = 256
+_view_cache: "OrderedDict[tuple, PlanViewResponse]" = OrderedDict()
+_view_cache_lock = threading.Lock()
+
 
 @router.post("/meal", response_model=PlanGenerateSummary)
-async def create_meal_plan(
+def create_meal_plan(
     request: PlanGenerateRequest,
     db: Session = Depends(get_db),
 ):
     service = NutritionService(db)
-    plan = await service.generate_meal_plan(duration_days=request.duration_days)
+    # Runs on the threadpool (sync endpoint); plan generation blocks on Bedrock
+    plan = asyncio.run(service.generate_meal_plan(duration_days=request.duration_days))
 
-    # plan.plan_data is already canonical (from MealPlanGenerator)
-    meal_data = MealPlanData.from_stored(plan.plan_data)
     return PlanGenerateSummary(
         plan_id=plan.id,
         start_date=plan.start_date,
         end_date=plan.end_date,  # May be None for ongoing plans
         duration_days=plan.duration_days,  # May be None
-        data=meal_data.model_dump(mode="json", exclude_none=False),
+        data=plan.plan_data,  # Already canonical MealPlanData JSON (from MealPlanGenerator)
     )
 
 
 @router.post("/workout", response_model=PlanGenerateSummary)
-async def create_workout_plan(
+def create_workout_plan(
     request: PlanGenerateRequest,
     db: Session = Depends(get_db),
 ):
     service = TrainingService(db)
-    plan = await service.generate_workout_plan(duration_days=request.duration_days)
+    # Runs on the threadpool (sync endpoint); plan generation blocks on Bedrock
+    plan = asyncio.run(service.generate_workout_plan(duration_days=request.duration_days))
 
-    # plan.plan_data is already canonical (from WorkoutPlanGenerator)
-    workout_data = WorkoutPlanData.from_stored(plan.plan_data)
     return PlanGenerateSummary(
         plan_id=plan.id,
         start_date=plan.start_date,
         end_date=plan.end_date,  # May be None for ongoing plans
         duration_days=plan.duration_days,  # May be None
-        data=workout_data.model_dump(mode="json", exclude_none=False),
+        data=plan.plan_data,  # Already canonical WorkoutPlanData JSON (from WorkoutPlanGenerator)
     )
 
 
 @router.get("/{plan_id}/view", response_model=PlanViewResponse)
 @log_function_call()
-async def get_plan_view(
+def get_plan_view(
     plan_id: str,
     query_date: Optional[date] = Query(None, alias="date", description="Date for the view (default: today)"),
     include_detail: bool = Query(True, description="Include full recipe/exercise details (default: true for day view)"),
@@ -72,10 +77,18 @@ async def get_plan_view(
     """Get today's view for a plan (meals or workout) for the given date."""
     view_date = query_date if query_date is not None else date.today()
     user = UserDAO(db).get_or_create_temp_user()
-    plan = PlanDAO(db).get_by_id(plan_id, user.id)
+    # plan_data is only loaded (and validated) when the view isn't cached yet
+    plan = PlanDAO(db).get_by_id(plan_id, user.id, defer_data=True)
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
 
+    cache_key = (plan.id, plan.updated_at, view_date, include_detail)
+    with _view_cache_lock:
+        cached = _view_cache.get(cache_key)
+        if cached is not None:
+            _view_cache.move_to_end(cache_key)
+            return cached
+
     if plan.plan_type == PlanType.MEAL:
         service = NutritionService(db)
         payload = service.get_today_view_for_plan(plan, view_date, include_detail=include_detail)
@@ -85,6 +98,11 @@ async def get_plan_view(
     else:
         raise HTTPException(status_code=400, detail="Unsupported plan type")
 
-    return PlanViewResponse(**payload)
+    view = PlanViewResponse(**payload)
+    with _view_cache_lock:
+        _view_cache[cache_key] = view
+        if len(_view_cache) > _VIEW_CACHE_SIZE:
+            _view_cache.popitem(last=False)
+    return view
 
 
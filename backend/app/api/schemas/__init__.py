@@ -3,6 +3,7 @@ from app.api.schemas.chat import (
     MessageCreate,
     MessageResponse,
     ConversationResponse,
+    ConversationMessagesResponse,
     ChatRequest,
     ChatResponse,
 )
@@ -20,6 +21,7 @@ __all__ = [
     "MessageCreate",
     "MessageResponse",
     "ConversationResponse",
+    "ConversationMessagesResponse",
     "ChatRequest",
     "ChatResponse",
     "AppStateResponse",
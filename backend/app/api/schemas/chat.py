@@ -34,6 +34,12 @@ class ConversationResponse(BaseModel):
         from_attributes = True
 
 
+class ConversationMessagesResponse(BaseModel):
+    """Schema for a conversation's message history."""
+    conversation_id: str
+    messages: List[MessageResponse]
+
+
 class ChatRequest(BaseModel):
     """Schema for chat request."""
     message: str
@@ -1,18 +1,51 @@
 """State API endpoint."""
+import threading
+import time
+from typing import Dict, Tuple
+
 from fastapi import APIRouter, Depends
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.api.schemas.state import AppStateResponse
+from app.dao import UserDAO
 from app.services.state import StateService
 
 router = APIRouter(prefix="/api", tags=["state"])
 
+# Bootstrap state per user, reused for a few seconds across page loads. Any commit in
+# this process (plan generated, goal saved, log written...) clears it and bumps the
+# generation; a state computed while that happened is not stored, since it may predate
+# the commit. So only writes made by other workers can be served stale, and then for at
+# most the TTL.
+_STATE_TTL_SECONDS = 5.0
+_state_cache: Dict[str, Tuple[float, AppStateResponse]] = {}
+_state_cache_lock = threading.Lock()
+_state_generation = 0
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _clear_state_cache(session: Session) -> None:
+    global _state_generation
+    with _state_cache_lock:
+        _state_cache.clear()
+        _state_generation += 1
+
 
 @router.get("/state", response_model=AppStateResponse)
-async def get_state(db: Session = Depends(get_db)) -> AppStateResponse:
+def get_state(db: Session = Depends(get_db)) -> AppStateResponse:
     """Get application bootstrap state for the current user."""
-    service = StateService(db)
-    return service.get_state()
-
+    user = UserDAO(db).get_or_create_temp_user()
+    now = time.monotonic()
+    with _state_cache_lock:
+        cached = _state_cache.get(user.id)
+        if cached is not None and now - cached[0] < _STATE_TTL_SECONDS:
+            return cached[1]
+        generation = _state_generation
 
+    state = StateService(db).get_state()
+    with _state_cache_lock:
+        if generation == _state_generation:
+            _state_cache[user.id] = (now, state)
+    return state
@@ -1,6 +1,7 @@
 """Application configuration."""
+from functools import lru_cache
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -9,6 +10,8 @@ class Settings(BaseSettings):
     # Application
     APP_NAME: str = "Fitnesse"
     DEBUG: bool = False
+    # Log level for app and uvicorn access logs; default DEBUG when DEBUG is on, else WARNING
+    LOG_LEVEL: Optional[str] = None
     
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -18,6 +21,10 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./fitnesse.db"  # Override with environment variable in production
+    # Pool ceiling (size + overflow) matches the 40-thread pool sync endpoints run on,
+    # so a request never waits for a connection. Keep under the RDS max_connections.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
     
     # Security
     SECRET_KEY: str = "change-me-in-production"
@@ -34,5 +41,11 @@ class Settings(BaseSettings):
         case_sensitive = True
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build settings once per process (env + .env parsing and validation)."""
+    return Settings()
+
+
+settings = get_settings()
 
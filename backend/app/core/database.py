@@ -7,11 +7,23 @@ from app.core.config import settings
 
 # SQLite needs check_same_thread=False
 connect_args = {}
+pool_args = {}
 if settings.DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
+else:
+    pool_args = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": 30,
+        # Drop connections RDS or a NAT closed while idle instead of failing a request
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, **pool_args)
+# expire_on_commit=False: rows we just wrote keep their in-memory values after
+# commit, so returning them doesn't cost a reload SELECT per object
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -1,10 +1,16 @@
 """Logging utilities and decorators."""
 import asyncio
+import atexit
 import functools
+import inspect
+import itertools
+import json
 import logging
+import logging.handlers
 import pprint
+import queue
 from datetime import date, datetime
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Dict, TypeVar
 
 # Max lines / chars for pretty-printed dicts in logs
 _PPRINT_MAX_LINES = 60
@@ -12,14 +18,159 @@ _PPRINT_MAX_CHARS = 4000
 
 from app.core.config import settings
 
-# Set up logging level based on DEBUG setting
-_level = logging.DEBUG if settings.DEBUG else logging.INFO
-logging.basicConfig(level=_level, format="%(levelname)s:     %(name)s - %(message)s")
+# Set up logging level based on DEBUG setting (LOG_LEVEL overrides). Production defaults
+# to WARNING: an INFO record per request, access log included, is a measurable share of
+# a short request's time.
+_level = settings.LOG_LEVEL.upper() if settings.LOG_LEVEL else (
+    logging.DEBUG if settings.DEBUG else logging.WARNING
+)
+# Records are handed to a queue and written to stderr by a listener thread, so a request
+# thread never blocks on the stream write. Started at import rather than on app startup
+# so records logged while modules load aren't dropped.
+_root = logging.getLogger()
+if not _root.handlers:  # same no-op-if-configured rule as basicConfig
+    _log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _stream_handler = logging.StreamHandler()
+    _stream_handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+    _root.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _root.setLevel(_level)
+    _listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+    _listener.start()
+    # Drain what's still queued on shutdown
+    atexit.register(_listener.stop)
 logging.getLogger("app").setLevel(_level)
+# uvicorn configures its loggers before importing the app, so this takes precedence
+if not settings.DEBUG:
+    logging.getLogger("uvicorn.access").setLevel(_level)
 
 F = TypeVar("F", bound=Callable[..., Any])
 
 
+class _Lazy:
+    """Defers an expensive format until a handler actually renders the record."""
+
+    __slots__ = ("fn", "args")
+
+    def __init__(self, fn: Callable[..., str], *args: Any):
+        self.fn = fn
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.fn(*self.args)
+
+
+def _format_dict(val: dict) -> str:
+    keys = list(val.keys())[:8]
+    keys_str = ", ".join(repr(k) for k in keys)
+    if len(val) > 8:
+        keys_str += ", ..."
+    return f"dict({len(val)} keys: {keys_str})"
+
+
+def _format_list(val: list) -> str:
+    return f"list(len={len(val)})"
+
+
+# Exact-type fast path for _format_value; subclasses (str enums etc.) take the isinstance ladder
+_FORMATTERS: Dict[type, Callable[[Any], str]] = {
+    str: repr,
+    int: repr,
+    float: repr,
+    bool: repr,
+    type(None): repr,
+    date: repr,
+    datetime: repr,
+    dict: _format_dict,
+    list: _format_list,
+}
+
+
+def _format_value(val: Any, max_len: int = 200) -> str:
+    """Format a value for logging: readable and bounded in length."""
+    handler = _FORMATTERS.get(type(val))
+    if handler is not None:
+        return handler(val)
+    if isinstance(val, (str, int, float, bool, type(None))):
+        return repr(val)
+    if isinstance(val, (date, datetime)):
+        return repr(val)  # e.g. date(2025, 2, 13)
+    if isinstance(val, dict):
+        return _format_dict(val)
+    if isinstance(val, list):
+        return _format_list(val)
+    # SQLAlchemy Session / engine – avoid dumping internals
+    cls_name = type(val).__name__
+    if "Session" in cls_name or "session" in cls_name.lower():
+        return f"<{cls_name}>"
+    # Pydantic model
+    if hasattr(val, "model_dump"):
+        try:
+            d = val.model_dump()
+            if "id" in d:
+                return f"{cls_name}(id={d['id']!r})"
+            return f"{cls_name}({list(d.keys())[:4]})"
+        except Exception:
+            return f"{cls_name}(...)"
+    if hasattr(val, "id"):
+        return f"{cls_name}(id={getattr(val, 'id')!r})"
+    return f"<{cls_name}>"
+
+
+def _truncate(s: str) -> str:
+    lines = s.splitlines()
+    if len(lines) > _PPRINT_MAX_LINES:
+        s = "\n".join(lines[:_PPRINT_MAX_LINES]) + "\n  ... (truncated)"
+    if len(s) > _PPRINT_MAX_CHARS:
+        s = s[:_PPRINT_MAX_CHARS] + "\n  ... (truncated)"
+    return s
+
+
+def _pretty_format(val: Any) -> str:
+    """Pretty-print dict/list-like structures, truncated to avoid huge logs."""
+    # Every top-level item takes at least one output line, so items past the line limit
+    # would be truncated anyway; drop them before serializing rather than after
+    if isinstance(val, dict) and len(val) > _PPRINT_MAX_LINES:
+        val = dict(itertools.islice(val.items(), _PPRINT_MAX_LINES))
+    elif isinstance(val, list) and len(val) > _PPRINT_MAX_LINES:
+        val = val[:_PPRINT_MAX_LINES]
+    # C-accelerated json first; pprint only for what json can't encode (e.g. tuple keys)
+    try:
+        s = json.dumps(val, indent=2, default=str, ensure_ascii=False)
+    except Exception:
+        try:
+            s = pprint.pformat(val, width=120, compact=False)
+        except Exception:
+            return repr(val)[:_PPRINT_MAX_CHARS]
+    return _truncate(s)
+
+
+def _format_result(result: Any) -> str:
+    """Format return value: pretty-print dicts and Pydantic models."""
+    if isinstance(result, (str, int, float, bool, type(None))):
+        return repr(result)
+    if isinstance(result, (date, datetime)):
+        return repr(result)
+    if isinstance(result, dict):
+        return _pretty_format(result)
+    if isinstance(result, list):
+        return _pretty_format(result)
+    cls_name = type(result).__name__
+    if hasattr(result, "model_dump_json"):
+        # Pydantic v2 serializes straight to JSON without building an intermediate dict
+        try:
+            return f"{cls_name}\n" + _truncate(result.model_dump_json(indent=2))
+        except Exception:
+            return f"{cls_name}(...)"
+    if hasattr(result, "model_dump"):
+        try:
+            return f"{cls_name}\n" + _pretty_format(result.model_dump())
+        except Exception:
+            return f"{cls_name}(...)"
+    if hasattr(result, "id"):
+        return f"{cls_name}(id={getattr(result, 'id')!r})"
+    return f"{cls_name}(...)"
+
+
 def log_function_call(logger: logging.Logger | None = None) -> Callable[[F], F]:
     """
     Decorator to log function calls with parameters and return values.
@@ -42,118 +193,61 @@ def log_function_call(logger: logging.Logger | None = None) -> Callable[[F], F]:
     """
     def decorator(func: F) -> F:
         func_logger = logger or logging.getLogger(func.__module__)
+        # Without DEBUG nothing is ever logged, so don't wrap at all (no extra frame per call)
+        if not settings.DEBUG and func_logger.getEffectiveLevel() > logging.DEBUG:
+            return func
         is_async = asyncio.iscoroutinefunction(func)
-        
-        def _format_value(val: Any, max_len: int = 200) -> str:
-            """Format a value for logging: readable and bounded in length."""
-            if isinstance(val, (str, int, float, bool, type(None))):
-                return repr(val)
-            if isinstance(val, (date, datetime)):
-                return repr(val)  # e.g. date(2025, 2, 13)
-            if isinstance(val, dict):
-                keys = list(val.keys())[:8]
-                keys_str = ", ".join(repr(k) for k in keys)
-                if len(val) > 8:
-                    keys_str += ", ..."
-                return f"dict({len(val)} keys: {keys_str})"
-            if isinstance(val, list):
-                return f"list(len={len(val)})"
-            # SQLAlchemy Session / engine – avoid dumping internals
-            cls_name = type(val).__name__
-            if "Session" in cls_name or "session" in cls_name.lower():
-                return f"<{cls_name}>"
-            # Pydantic model
-            if hasattr(val, "model_dump"):
-                try:
-                    d = val.model_dump()
-                    if "id" in d:
-                        return f"{cls_name}(id={d['id']!r})"
-                    return f"{cls_name}({list(d.keys())[:4]})"
-                except Exception:
-                    return f"{cls_name}(...)"
-            if hasattr(val, "id"):
-                return f"{cls_name}(id={getattr(val, 'id')!r})"
-            return f"<{cls_name}>"
-        
-        def _format_arg(arg: Any) -> str:
-            return _format_value(arg)
-        
-        def _pretty_format(val: Any) -> str:
-            """Pretty-print dict/list-like structures, truncated to avoid huge logs."""
-            try:
-                s = pprint.pformat(val, width=120, compact=False)
-            except Exception:
-                return repr(val)[:_PPRINT_MAX_CHARS]
-            lines = s.splitlines()
-            if len(lines) > _PPRINT_MAX_LINES:
-                s = "\n".join(lines[:_PPRINT_MAX_LINES]) + "\n  ... (truncated)"
-            if len(s) > _PPRINT_MAX_CHARS:
-                s = s[:_PPRINT_MAX_CHARS] + "\n  ... (truncated)"
-            return s
-
-        def _format_result(result: Any) -> str:
-            """Format return value: pretty-print dicts and Pydantic models."""
-            if isinstance(result, (str, int, float, bool, type(None))):
-                return repr(result)
-            if isinstance(result, (date, datetime)):
-                return repr(result)
-            if isinstance(result, dict):
-                return _pretty_format(result)
-            if isinstance(result, list):
-                return _pretty_format(result)
-            cls_name = type(result).__name__
-            if hasattr(result, "model_dump"):
-                try:
-                    return f"{cls_name}\n" + _pretty_format(result.model_dump())
-                except Exception:
-                    return f"{cls_name}(...)"
-            if hasattr(result, "id"):
-                return f"{cls_name}(id={getattr(result, 'id')!r})"
-            return f"{cls_name}(...)"
+        # Skip 'self'/'cls' when logging args; decided once here instead of per call
+        params = list(inspect.signature(func).parameters)
+        start_idx = 1 if params and params[0] in ("self", "cls") else 0
         
         if is_async:
             @functools.wraps(func)
             async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                # Formatting (pprint, model_dump) is the expensive part; skip all of it
+                # unless the debug records will actually be emitted
+                if not func_logger.isEnabledFor(logging.DEBUG):
+                    return await func(*args, **kwargs)
+                
                 # Format args (skip 'self' for methods)
-                args_repr = []
-                if args:
-                    start_idx = 1 if args and hasattr(args[0], func.__name__) else 0
-                    args_repr = [_format_arg(arg) for arg in args[start_idx:]]
+                args_repr = [_format_value(arg) for arg in args[start_idx:]]
                 
                 # Format kwargs
-                kwargs_repr = [f"{k}={_format_arg(v)}" for k, v in kwargs.items()]
+                kwargs_repr = [f"{k}={_format_value(v)}" for k, v in kwargs.items()]
                 params_str = ", ".join(args_repr + kwargs_repr)
-                func_logger.debug(f"{func.__name__}({params_str})")
+                func_logger.debug("%s(%s)", func.__name__, params_str)
                 
                 try:
                     result = await func(*args, **kwargs)
-                    func_logger.debug(f"{func.__name__} -> {_format_result(result)}")
+                    func_logger.debug("%s -> %s", func.__name__, _Lazy(_format_result, result))
                     return result
                 except Exception as e:
-                    func_logger.debug(f"{func.__name__} -> Exception: {type(e).__name__}: {e}")
+                    func_logger.debug("%s -> Exception: %s: %s", func.__name__, type(e).__name__, e)
                     raise
             
             return async_wrapper  # type: ignore
         else:
             @functools.wraps(func)
             def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                # Formatting (pprint, model_dump) is the expensive part; skip all of it
+                # unless the debug records will actually be emitted
+                if not func_logger.isEnabledFor(logging.DEBUG):
+                    return func(*args, **kwargs)
+                
                 # Format args (skip 'self' for methods)
-                args_repr = []
-                if args:
-                    start_idx = 1 if args and hasattr(args[0], func.__name__) else 0
-                    args_repr = [_format_arg(arg) for arg in args[start_idx:]]
+                args_repr = [_format_value(arg) for arg in args[start_idx:]]
                 
                 # Format kwargs
-                kwargs_repr = [f"{k}={_format_arg(v)}" for k, v in kwargs.items()]
+                kwargs_repr = [f"{k}={_format_value(v)}" for k, v in kwargs.items()]
                 params_str = ", ".join(args_repr + kwargs_repr)
-                func_logger.debug(f"{func.__name__}({params_str})")
+                func_logger.debug("%s(%s)", func.__name__, params_str)
                 
                 try:
                     result = func(*args, **kwargs)
-                    func_logger.debug(f"{func.__name__} -> {_format_result(result)}")
+                    func_logger.debug("%s -> %s", func.__name__, _Lazy(_format_result, result))
                     return result
                 except Exception as e:
-                    func_logger.debug(f"{func.__name__} -> Exception: {type(e).__name__}: {e}")
+                    func_logger.debug("%s -> Exception: %s: %s", func.__name__, type(e).__name__, e)
                     raise
             
             return sync_wrapper  # type: ignore
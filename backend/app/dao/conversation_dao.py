@@ -1,7 +1,7 @@
 """Conversation Data Access Object."""
-import uuid
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from app.core.ids import new_id
 from app.models.conversation import Conversation, AgentType
 
 
@@ -13,32 +13,43 @@ class ConversationDAO:
     
     def get_by_id(self, conversation_id: str) -> Optional[Conversation]:
         """Get conversation by ID."""
-        return self.db.query(Conversation).filter(
+        return self.db.get(Conversation, conversation_id)
+    
+    def get_with_messages(self, conversation_id: str) -> Optional[Conversation]:
+        """Get conversation by ID with its messages loaded in the same query."""
+        return self.db.query(Conversation).options(
+            joinedload(Conversation.messages)
+        ).filter(
             Conversation.id == conversation_id
         ).first()
     
-    def create(self, user_id: str, agent_type: AgentType = AgentType.ONBOARDING) -> Conversation:
-        """Create a new conversation."""
+    def create(
+        self, user_id: str, agent_type: AgentType = AgentType.ONBOARDING, commit: bool = True
+    ) -> Conversation:
+        """Create a new conversation (commit=False leaves it pending for the caller's next commit)."""
         conversation = Conversation(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=user_id,
             agent_type=agent_type
         )
         self.db.add(conversation)
-        self.db.commit()
-        self.db.refresh(conversation)
+        if commit:
+            self.db.commit()
         return conversation
     
-    def get_or_create(self, user_id: str, conversation_id: Optional[str] = None) -> Conversation:
+    def get_or_create(
+        self, user_id: str, conversation_id: Optional[str] = None, commit: bool = True
+    ) -> Conversation:
         """Get existing conversation or create a new one."""
         if conversation_id:
             conversation = self.get_by_id(conversation_id)
             if conversation:
                 return conversation
-        return self.create(user_id)
+        return self.create(user_id, commit=commit)
     
-    def update_agent_type(self, conversation: Conversation, agent_type: AgentType) -> None:
-        """Update the agent type for a conversation."""
+    def update_agent_type(self, conversation: Conversation, agent_type: AgentType, commit: bool = True) -> None:
+        """Update the agent type for a conversation (commit=False leaves it for the caller's next commit)."""
         conversation.agent_type = agent_type
-        self.db.commit()
+        if commit:
+            self.db.commit()
 
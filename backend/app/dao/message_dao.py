@@ -1,7 +1,9 @@
 """Message Data Access Object."""
-import uuid
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
+from app.core.ids import new_id
 from app.models.message import Message
 
 
@@ -11,17 +13,25 @@ class MessageDAO:
     def __init__(self, db: Session):
         self.db = db
     
-    def create(self, conversation_id: str, role: str, content: str) -> Message:
-        """Create a new message."""
+    def create(self, conversation_id: str, role: str, content: str, commit: bool = True) -> Message:
+        """
+        Create a new message.
+        
+        With commit=False the message is only added to the session; it is inserted by
+        the caller's next commit, batched with any other pending messages.
+        """
         message = Message(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             conversation_id=conversation_id,
             role=role,
-            content=content
+            content=content,
+            # Set client-side: server now() is per-transaction, so messages
+            # committed together would otherwise share a timestamp
+            created_at=datetime.now(timezone.utc)
         )
         self.db.add(message)
-        self.db.commit()
-        self.db.refresh(message)
+        if commit:
+            self.db.commit()
         return message
     
     def get_by_conversation(self, conversation_id: str) -> List[Message]:
@@ -29,4 +39,26 @@ class MessageDAO:
         return self.db.query(Message).filter(
             Message.conversation_id == conversation_id
         ).order_by(Message.created_at).all()
-
+    
+    def get_recent(
+        self, conversation_id: str, limit: int, before_id: Optional[str] = None
+    ) -> List[Message]:
+        """
+        Get the last `limit` messages for a conversation, oldest first.
+        
+        With before_id, only messages older than that message are returned (keyset
+        paging: walks the (conversation_id, created_at) index, never an OFFSET scan).
+        """
+        query = self.db.query(Message).filter(Message.conversation_id == conversation_id)
+        if before_id is not None:
+            cursor = self.db.get(Message, before_id)
+            if cursor is None or cursor.conversation_id != conversation_id:
+                return []
+            # id breaks created_at ties so a page boundary never skips or repeats a row
+            query = query.filter(
+                tuple_(Message.created_at, Message.id) < tuple_(cursor.created_at, cursor.id)
+            )
+        recent = query.order_by(
+            Message.created_at.desc(), Message.id.desc()
+        ).limit(limit).all()
+        return list(reversed(recent))
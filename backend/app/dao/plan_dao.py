@@ -1,6 +1,6 @@
 """Plan Data Access Object."""
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Dict, Optional
+from sqlalchemy.orm import Session, defer
 
 from app.models.plan import Plan, PlanType
 
@@ -11,13 +11,13 @@ class PlanDAO:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_by_id(self, plan_id: str, user_id: str) -> Optional[Plan]:
-        """Get a plan by id if it belongs to the user."""
-        return (
-            self.db.query(Plan)
-            .filter(Plan.id == plan_id, Plan.user_id == user_id)
-            .first()
-        )
+    def get_by_id(self, plan_id: str, user_id: str, defer_data: bool = False) -> Optional[Plan]:
+        """Get a plan by id if it belongs to the user (defer_data: load plan_data only on access)."""
+        options = [defer(Plan.plan_data)] if defer_data else None
+        plan = self.db.get(Plan, plan_id, options=options)
+        if plan is None or plan.user_id != user_id:
+            return None
+        return plan
 
     def get_active_plan(self, user_id: str, plan_type: PlanType) -> Optional[Plan]:
         """Get the active plan for a user and type."""
@@ -31,4 +31,17 @@ class PlanDAO:
             .first()
         )
 
-
+    def get_active_plans(self, user_id: str) -> Dict[PlanType, Plan]:
+        """Get the user's active plan of each type in one query."""
+        plans = (
+            self.db.query(Plan)
+            .filter(
+                Plan.user_id == user_id,
+                Plan.is_active == True,  # noqa: E712
+            )
+            .all()
+        )
+        active: Dict[PlanType, Plan] = {}
+        for plan in plans:
+            active.setdefault(plan.plan_type, plan)
+        return active
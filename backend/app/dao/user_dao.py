@@ -1,33 +1,90 @@
 """User Data Access Object."""
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, defer, make_transient_to_detached
 from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.goal import Goal
+from app.models.plan import Plan, PlanType
+
+# Users known to exist, kept detached and re-attached to each request's session
+# with merge(load=False) so repeat lookups don't hit the database.
+_known_users: Dict[str, User] = {}
 
 
 class UserDAO:
     """Data access object for User operations."""
-    
+
     def __init__(self, db: Session):
         self.db = db
-    
+
     def get_by_id(self, user_id: str) -> User | None:
         """Get user by ID."""
-        return self.db.query(User).filter(User.id == user_id).first()
-    
+        return self.db.get(User, user_id)
+
     def create(self, user_id: str, email: str) -> User:
         """Create a new user."""
         user = User(id=user_id, email=email)
         self.db.add(user)
         self.db.commit()
-        self.db.refresh(user)
         return user
-    
+
+    def get_or_create(self, user_id: str, email: str) -> User:
+        """Get a user, inserting it first if missing (race-free upsert, cached per process)."""
+        cached = _known_users.get(user_id)
+        if cached is not None:
+            return self.db.merge(cached, load=False)
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            self.db.execute(
+                insert(User)
+                .values(id=user_id, email=email)
+                .on_conflict_do_nothing(index_elements=["id"])
+            )
+            self.db.commit()
+            user = self.get_by_id(user_id)
+        else:
+            user = self.get_by_id(user_id) or self.create(user_id, email)
+
+        detached = User(id=user.id, email=user.email, created_at=user.created_at)
+        make_transient_to_detached(detached)
+        _known_users[user_id] = detached
+        return user
+
     def get_or_create_temp_user(self) -> User:
         """Get or create the temporary user. TODO: Replace with auth."""
         temp_user_id = "temp-user-123"
         temp_user_email = "temp@fitnesse.local"
-        
-        user = self.get_by_id(temp_user_id)
-        if not user:
-            user = self.create(temp_user_id, temp_user_email)
-        return user
+        return self.get_or_create(temp_user_id, temp_user_email)
 
+    def get_coordination_context(
+        self, user_id: str
+    ) -> Tuple[Optional[UserProfile], List[Goal], Dict[PlanType, Plan]]:
+        """Get the user's profile, active goals and active plan of each type in one query."""
+        # Outer joins off the user row: one row per (goal, plan) pair, which for a handful
+        # of goals and at most one plan per type is cheaper than three round trips.
+        # plan_data (the largest column) would repeat on every goal's row, so it is
+        # deferred: parsed plans are cached by (id, updated_at), and it is only loaded,
+        # once per plan, when that cache misses.
+        rows = self.db.execute(
+            select(UserProfile, Goal, Plan)
+            .select_from(User)
+            .outerjoin(UserProfile, UserProfile.user_id == User.id)
+            .outerjoin(Goal, and_(Goal.user_id == User.id, Goal.is_active == True))  # noqa: E712
+            .outerjoin(Plan, and_(Plan.user_id == User.id, Plan.is_active == True))  # noqa: E712
+            .where(User.id == user_id)
+            .options(defer(Plan.plan_data))
+        ).all()
+        profile = rows[0][0] if rows else None
+        goals: Dict[str, Goal] = {}
+        active_plans: Dict[PlanType, Plan] = {}
+        for _, goal, plan in rows:
+            if goal is not None:
+                goals.setdefault(goal.id, goal)
+            if plan is not None:
+                active_plans.setdefault(plan.plan_type, plan)
+        return profile, list(goals.values()), active_plans
@@ -1,5 +1,5 @@
 """Goal model for storing user objectives and success metrics."""
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, JSON, Date, Boolean, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, JSON, Date, Boolean, Text, Enum as SQLEnum, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -40,6 +40,10 @@ class Goal(Base):
     is measured (e.g., {"primary": "lose_weight", "target_kg": 5, "timeframe_weeks": 12}).
     """
     __tablename__ = "goals"
+    __table_args__ = (
+        # Active-goal lookups per user; partial on Postgres so only active rows are indexed
+        Index("ix_goals_user_active", "user_id", "is_active", postgresql_where=text("is_active")),
+    )
 
     id = Column(String, primary_key=True, index=True)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
@@ -1,10 +1,10 @@
 """Goal check-in logging model."""
-import uuid
 from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.core.ids import new_id
 
 
 class GoalCheckIn(Base):
@@ -12,7 +12,7 @@ class GoalCheckIn(Base):
 
     __tablename__ = "goal_checkins"
 
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, index=True, default=new_id)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
 
     text = Column(Text, nullable=False)
@@ -1,12 +1,12 @@
 """Unified logging model (meals, workouts, goal check-ins, etc.)."""
 import enum
-import uuid
 
 from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Enum as SQLEnum, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.core.ids import new_id
 
 
 class LogType(str, enum.Enum):
@@ -20,7 +20,7 @@ class Log(Base):
 
     __tablename__ = "logs"
 
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, index=True, default=new_id)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
 
     # Store enum values ("meal", "workout", "goal_checkin") in the DB, not the member names.
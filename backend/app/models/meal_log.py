@@ -1,10 +1,10 @@
 """Meal logging model."""
-import uuid
 from sqlalchemy import Column, String, DateTime, ForeignKey, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.core.ids import new_id
 
 
 class MealLog(Base):
@@ -12,7 +12,7 @@ class MealLog(Base):
 
     __tablename__ = "meal_logs"
 
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, index=True, default=new_id)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
 
     raw_text = Column(String, nullable=False)
@@ -1,5 +1,5 @@
 """Message model."""
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -9,6 +9,10 @@ from app.core.database import Base
 class Message(Base):
     """Message model."""
     __tablename__ = "messages"
+    __table_args__ = (
+        # History reads filter by conversation and order by created_at
+        Index("ix_messages_conv_created", "conversation_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     conversation_id = Column(String, ForeignKey("conversations.id"), nullable=False, index=True)
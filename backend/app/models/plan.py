@@ -1,7 +1,7 @@
 """Plan models for storing diet and exercise plans."""
 import enum
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Date, Boolean, Integer, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Date, Boolean, Integer, Enum as SQLEnum, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -23,6 +23,16 @@ class Plan(Base):
     recommendations tailored to the user's goals and profile.
     """
     __tablename__ = "plans"
+    __table_args__ = (
+        # Active-plan lookups per user and type; partial on Postgres so only active rows are indexed
+        Index(
+            "ix_plans_user_type_active",
+            "user_id",
+            "plan_type",
+            "is_active",
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     id = Column(String, primary_key=True, index=True)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
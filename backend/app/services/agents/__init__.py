@@ -1,5 +1,27 @@
 """Shared agent types and interfaces."""
 from app.services.agents.response import AgentResponse, Transition
+from app.services.agents.confirmation import (
+    CONFIRM_INSTRUCTION,
+    CONFIRM_PROMPT,
+    CONFIRM_PROMPT_MARKER,
+    CONFIRM_REPLY,
+    DECLINE_REPLY,
+    LOG_REQUEST,
+    QUESTION,
+    awaiting_confirmation,
+    skip_classifier,
+)
 
-__all__ = ["AgentResponse", "Transition"]
-
+__all__ = [
+    "AgentResponse",
+    "Transition",
+    "CONFIRM_INSTRUCTION",
+    "CONFIRM_PROMPT",
+    "CONFIRM_PROMPT_MARKER",
+    "CONFIRM_REPLY",
+    "DECLINE_REPLY",
+    "LOG_REQUEST",
+    "QUESTION",
+    "awaiting_confirmation",
+    "skip_classifier",
+]
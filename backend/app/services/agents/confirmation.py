@@ -0,0 +1,61 @@
+"""Confirm-to-save handshake and reply patterns shared by the logging agents and the chat service."""
+import re
+from typing import List
+
+from app.models.message import Message
+
+# Appended to a suggested meal/workout log; the next user reply may confirm saving it
+CONFIRM_PROMPT = "Reply *yes* to save, or tell me what to change."
+# Lowercased phrase used to recognise that prompt in an earlier assistant message
+CONFIRM_PROMPT_MARKER = "reply *yes* to save"
+
+# Unambiguous answers (lowercased, stripped), decided without any LLM call. Whole-reply
+# matches only: "yes but make it 2 eggs" is a correction, not a confirmation.
+CONFIRM_REPLY = re.compile(
+    r"(yes|yes please|yep|yeah|yup|y|sure|ok|okay|save|save it|looks good|sounds good|correct|perfect)[.!]*"
+)
+DECLINE_REPLY = re.compile(r"(no|nope|n|no thanks|cancel|don't save|dont save|never mind|nevermind)[.!]*")
+
+# Plain questions are never logs, so they skip the log classifier call (see skip_classifier)
+QUESTION = re.compile(r"(what|how|why|when|where|which|who|can|could|should|is|are|do|does)\b.*\?$", re.DOTALL)
+# ...unless they ask for a log or save: "can you log 2 eggs and toast?"
+LOG_REQUEST = re.compile(r"\b(log|logged|save|saved|record|track|add)\b")
+
+# Added to an agent's classifier prompt when the user is replying to CONFIRM_PROMPT, so the
+# one classifier call also says whether the reply confirms the save
+CONFIRM_INSTRUCTION = (
+    "The assistant's last message suggested a log and asked the user to confirm it. "
+    "Set confirm_previous true if the user agrees to save it (e.g. yes, yep, save it, looks good, correct). "
+    "Set confirm_previous false if they are correcting the log, asking a question, or declining. "
+    "Include confirm_previous in the JSON alongside the other field."
+)
+
+
+def awaiting_confirmation(history: List[Message]) -> bool:
+    """Whether the latest user message in history answers our confirm prompt."""
+    if len(history) < 3:
+        return False
+    last_user, last_assistant, prev_user = history[-1], history[-2], history[-3]
+    return (
+        last_user.role == "user"
+        and last_assistant.role == "assistant"
+        and prev_user.role == "user"
+        and CONFIRM_PROMPT_MARKER in (last_assistant.content or "").lower()
+    )
+
+
+def skip_classifier(lower_msg: str, history: List[Message]) -> bool:
+    """
+    Whether a (lowercased, stripped) user message is plainly neither a log nor a
+    confirmation, so the agent's log classifier call can be skipped.
+    
+    A plain "no" always is. A question is, unless it asks for a log or save, or answers
+    our confirm prompt ("could you save that?" after a suggested log).
+    """
+    if DECLINE_REPLY.fullmatch(lower_msg):
+        return True
+    return (
+        QUESTION.match(lower_msg) is not None
+        and LOG_REQUEST.search(lower_msg) is None
+        and not awaiting_confirmation(history)
+    )
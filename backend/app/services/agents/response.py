@@ -5,7 +5,7 @@ from typing import Optional, Dict, Any
 from app.models.conversation import AgentType
 
 
-@dataclass
+@dataclass(slots=True)
 class Transition:
     """Represents a transition to another agent."""
     target_agent: AgentType
@@ -13,7 +13,7 @@ class Transition:
     context: Dict[str, Any] = field(default_factory=dict)  # Context to pass to target agent
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse:
     """Standardized response from any agent."""
     content: str
@@ -1,12 +1,15 @@
 """AWS Bedrock service for LLM interactions."""
+import functools
 import json
-from typing import Dict, List, Optional, Any, Type, TypeVar
-from botocore.exceptions import ClientError
+import re
+from typing import Callable, Dict, List, Optional, Any, Tuple, Type, TypeVar
+from botocore.config import Config
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    retry_if_exception,
     RetryError
 )
 
@@ -15,6 +18,85 @@ from app.core.config import settings
 
 T = TypeVar('T')
 
+# First markdown code block (```json or bare ```); an unclosed fence runs to the end
+_FENCE_RE = re.compile(r"```(?:json)?(.*?)(?:```|\Z)", re.DOTALL)
+
+
+# One HTTP connection per worker thread (sync endpoints run on a 40-thread pool; botocore's
+# default of 10 makes the rest open and throw away a connection per call). Retries are left
+# to the tenacity policy below rather than stacked on botocore's own.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=40,
+    retries={"mode": "standard", "total_max_attempts": 1},
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(region_name: str):
+    """Create the bedrock-runtime client once per region; boto3 clients are thread-safe."""
+    return boto3.client('bedrock-runtime', region_name=region_name, config=_CLIENT_CONFIG)
+
+
+# Error codes worth another attempt. Anything else (ValidationException for an unsupported
+# response_format, AccessDeniedException, ...) fails the same way every time, so retrying
+# only adds the backoff delay before the caller's fallback runs.
+_RETRYABLE_ERROR_CODES = frozenset({
+    "ThrottlingException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ModelTimeoutException",
+    "ModelNotReadyException",
+    "ModelStreamErrorException",
+})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, ClientError):
+        return exc.response.get('Error', {}).get('Code', '') in _RETRYABLE_ERROR_CODES
+    # Connection resets and read timeouts (HTTPClientError); connect timeouts and
+    # unreachable endpoints (botocore's ConnectionError)
+    return isinstance(exc, (HTTPClientError, BotoConnectionError))
+
+
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    retry=retry_if_exception(_is_retryable),
+    reraise=True
+)
+
+
+# id(schema) -> (schema, json_instruction, response_format). Callers pass module-level
+# schema constants, so each is formatted once; holding the schema keeps its id from being
+# reused by another object while the entry exists.
+_schema_parts: Dict[int, Tuple[Dict[str, Any], str, Dict[str, Any]]] = {}
+_SCHEMA_PARTS_MAX = 64
+
+
+def _schema_prompt_parts(output_schema: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """JSON-only system prompt suffix and response_format for a schema, built once per schema."""
+    cached = _schema_parts.get(id(output_schema))
+    if cached is not None and cached[0] is output_schema:
+        return cached[1], cached[2]
+
+    # Enhance system prompt to enforce JSON output
+    json_instruction = f"\n\nIMPORTANT: You MUST respond with valid JSON only, following this exact schema: {json.dumps(output_schema, indent=2)}\nDo not include any text outside the JSON object. The JSON must be well-formed and match the schema exactly."
+    # Try with structured output format (if supported by the model)
+    # Claude 3.5 Sonnet supports response_format for structured outputs
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "structured_output",
+            "strict": True,
+            "schema": output_schema,
+            "description": "Structured output matching the provided schema"
+        }
+    }
+    if len(_schema_parts) >= _SCHEMA_PARTS_MAX:
+        _schema_parts.clear()
+    _schema_parts[id(output_schema)] = (output_schema, json_instruction, response_format)
+    return json_instruction, response_format
+
 
 class BedrockService:
     """Service for interacting with AWS Bedrock."""
@@ -32,10 +114,8 @@ class BedrockService:
             Exception: If AWS credentials are not configured or Bedrock client cannot be created.
         """
         try:
-            self.client = boto3.client(
-                'bedrock-runtime',
-                region_name=settings.AWS_REGION
-            )
+            # Shared across instances: agents and services build a BedrockService per request
+            self.client = _get_client(settings.AWS_REGION)
             # Use provided model_id or default from settings
             self.model_id = model_id if model_id else settings.BEDROCK_MODEL_ID
         except Exception as e:
@@ -55,12 +135,7 @@ class BedrockService:
             else:
                 raise Exception(f"Failed to initialize Bedrock client: {error_msg}")
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((ClientError, Exception)),
-        reraise=True
-    )
+    @_retry_transient
     def _invoke_model(
         self,
         body: Dict[str, Any]
@@ -69,22 +144,30 @@ class BedrockService:
         Internal method to invoke Bedrock model with retry logic.
         
         Raises:
-            ClientError: For non-retryable errors (ValidationException, AccessDeniedException)
-            Exception: For other errors that should be retried
+            ClientError: As raised by boto3; only throttling/transient codes are retried
         """
-        try:
-            response = self.client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(body)
-            )
-            return json.loads(response['body'].read())
-        except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', '')
-            # Don't retry on validation or access errors
-            if error_code in ['ValidationException', 'AccessDeniedException']:
-                raise
-            # Retry on other errors
-            raise Exception(f"Bedrock invocation failed: {str(e)}")
+        response = self.client.invoke_model(
+            modelId=self.model_id,
+            body=json.dumps(body)
+        )
+        return json.loads(response['body'].read())
+    
+    @_retry_transient
+    def _open_model_stream(
+        self,
+        body: Dict[str, Any]
+    ):
+        """
+        Start a streaming Bedrock invocation with the same retry policy as _invoke_model.
+        
+        Only opening the stream is retried: once deltas have been handed to the caller,
+        a retry would repeat them.
+        """
+        response = self.client.invoke_model_with_response_stream(
+            modelId=self.model_id,
+            body=json.dumps(body)
+        )
+        return response['body']
     
     def invoke(
         self,
@@ -92,7 +175,8 @@ class BedrockService:
         system_prompt: Optional[str] = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
-        response_format: Optional[Dict[str, Any]] = None
+        response_format: Optional[Dict[str, Any]] = None,
+        on_delta: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Invoke Bedrock model with messages.
@@ -103,6 +187,8 @@ class BedrockService:
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature (0.0 to 1.0)
             response_format: Optional response format specification for structured outputs
+            on_delta: Optional callback; if given, the response is streamed and each
+                    text fragment is passed to it as it arrives
         
         Returns:
             Generated response text
@@ -134,11 +220,26 @@ class BedrockService:
             body["response_format"] = response_format
         
         try:
+            if on_delta:
+                return self._stream_text(body, on_delta)
             response_body = self._invoke_model(body)
             return response_body['content'][0]['text']
         except RetryError as e:
             raise Exception(f"Bedrock invocation failed after retries: {str(e.last_attempt.exception())}")
     
+    def _stream_text(self, body: Dict[str, Any], on_delta: Callable[[str], None]) -> str:
+        """Stream a response, passing each text delta to on_delta; returns the full text."""
+        parts = []
+        for event in self._open_model_stream(body):
+            if 'chunk' not in event:
+                continue
+            chunk = json.loads(event['chunk']['bytes'])
+            if chunk.get('type') == 'content_block_delta' and chunk['delta'].get('type') == 'text_delta':
+                text = chunk['delta']['text']
+                parts.append(text)
+                on_delta(text)
+        return "".join(parts)
+    
     def invoke_structured(
         self,
         messages: List[Dict[str, str]],
@@ -167,23 +268,9 @@ class BedrockService:
             ValueError: If response doesn't match schema or can't be parsed
             Exception: If Bedrock invocation fails
         """
-        # Enhance system prompt to enforce JSON output
-        json_instruction = f"\n\nIMPORTANT: You MUST respond with valid JSON only, following this exact schema: {json.dumps(output_schema, indent=2)}\nDo not include any text outside the JSON object. The JSON must be well-formed and match the schema exactly."
-        
+        json_instruction, response_format = _schema_prompt_parts(output_schema)
         enhanced_system_prompt = (system_prompt or "") + json_instruction
         
-        # Try with structured output format (if supported by the model)
-        # Claude 3.5 Sonnet supports response_format for structured outputs
-        response_format = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": "structured_output",
-                "strict": True,
-                "schema": output_schema,
-                "description": "Structured output matching the provided schema"
-            }
-        }
-        
         try:
             response_text = self.invoke(
                 messages=messages,
@@ -208,10 +295,9 @@ class BedrockService:
         # Parse JSON response
         try:
             # Remove markdown code blocks if present
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
+            fenced = _FENCE_RE.search(response_text)
+            if fenced:
+                response_text = fenced.group(1).strip()
             
             parsed = json.loads(response_text)
             return parsed
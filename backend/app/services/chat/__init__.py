@@ -1,5 +1,4 @@
 """Chat service for orchestrating agent interactions."""
-from app.services.chat.chat_service import ChatService
-
-__all__ = ["ChatService"]
+from app.services.chat.chat_service import ChatService, ChatResult
 
+__all__ = ["ChatService", "ChatResult"]
@@ -1,5 +1,6 @@
 """Agent router - factory for getting agent instances."""
-from typing import Protocol
+import functools
+from typing import Callable, Dict, Optional, Protocol
 from sqlalchemy.orm import Session
 
 from app.models.conversation import AgentType
@@ -9,8 +10,18 @@ from app.services.agents import AgentResponse
 class Agent(Protocol):
     """Protocol defining the agent interface."""
     
-    async def process(self, message: str, history: list) -> AgentResponse:
-        """Process a user message and return a response."""
+    async def process(
+        self,
+        message: str,
+        history: list,
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> AgentResponse:
+        """
+        Process a user message and return a response.
+        
+        Agents that answer in free text may also pass reply fragments to on_delta
+        as they are generated; the returned content is always the full reply.
+        """
         ...
     
     async def get_greeting(self) -> AgentResponse:
@@ -24,21 +35,31 @@ class AgentRouter:
     def __init__(self, db: Session, user_id: str):
         self.db = db
         self.user_id = user_id
+        # One router serves one turn, so each agent it hands out is built at most once
+        self._agents: Dict[AgentType, Agent] = {}
     
     def get_agent(self, agent_type: AgentType) -> Agent:
         """Get the agent instance for the given type."""
-        # Import here to avoid circular imports
-        from app.services.onboarding import OnboardingAgent
-        from app.services.coordination import CoordinationAgent
-        from app.services.nutritionist import NutritionistAgent
-        from app.services.trainer import TrainerAgent
-        
-        agents = {
-            AgentType.ONBOARDING: OnboardingAgent,
-            AgentType.COORDINATION: CoordinationAgent,
-            AgentType.NUTRITIONIST: NutritionistAgent,
-            AgentType.TRAINER: TrainerAgent,
-        }
-        
-        agent_class = agents.get(agent_type, CoordinationAgent)
-        return agent_class(db=self.db, user_id=self.user_id)
+        agent = self._agents.get(agent_type)
+        if agent is None:
+            agents = _agent_classes()
+            agent_class = agents.get(agent_type, agents[AgentType.COORDINATION])
+            agent = self._agents[agent_type] = agent_class(db=self.db, user_id=self.user_id)
+        return agent
+
+
+@functools.lru_cache(maxsize=None)
+def _agent_classes() -> Dict[AgentType, type]:
+    """AgentType → agent class table, built once on first use."""
+    # Import here to avoid circular imports
+    from app.services.onboarding import OnboardingAgent
+    from app.services.coordination import CoordinationAgent
+    from app.services.nutritionist import NutritionistAgent
+    from app.services.trainer import TrainerAgent
+    
+    return {
+        AgentType.ONBOARDING: OnboardingAgent,
+        AgentType.COORDINATION: CoordinationAgent,
+        AgentType.NUTRITIONIST: NutritionistAgent,
+        AgentType.TRAINER: TrainerAgent,
+    }
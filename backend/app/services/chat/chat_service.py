@@ -1,20 +1,20 @@
 """Chat service for orchestrating agent interactions."""
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Callable, Optional, List
 from sqlalchemy.orm import Session
 
 from app.models.message import Message
 from app.models.conversation import AgentType
 from app.dao import UserDAO, ConversationDAO, MessageDAO
 from app.services.chat.agent_router import AgentRouter
-from app.services.agents import AgentResponse
-from app.services.bedrock import BedrockService
+from app.services.agents import AgentResponse, CONFIRM_REPLY, awaiting_confirmation
 from app.services.nutritionist.logging.meal_logging_service import MealLoggingService
 from app.services.trainer.logging.workout_logging_service import WorkoutLoggingService
 
-# Phrase we put in assistant messages when asking user to confirm a log; used to detect "confirm?" context
-CONFIRM_PROMPT_MARKER = "reply *yes* to save"
+# Most recent messages handed to agents; older history is never loaded
+HISTORY_LIMIT = 40
+
 
 
 @dataclass
@@ -39,79 +39,56 @@ class ChatService:
         self,
         message: str,
         conversation_id: Optional[str] = None,
-        agent_type: Optional[str] = None
+        agent_type: Optional[str] = None,
+        on_delta: Optional[Callable[[str], None]] = None
     ) -> ChatResult:
         """
-        Process a chat message. Uses conversation history + low-temp LLM to detect
-        when the user is confirming a suggested meal/workout log; then re-parses
-        the previous user message and saves. No pending state on the server.
+        Process a chat message. Uses conversation history to detect a reply to a
+        suggested meal/workout log; if the user confirms it (plain yes, or as judged
+        by the agent's classifier call), re-parses the previous user message and
+        saves. No pending state on the server.
+        
+        If on_delta is given, free-text agent replies are streamed to it as they are
+        generated. The returned assistant message is still the complete reply.
         """
         user = self.user_dao.get_or_create_temp_user()
-        conversation = self.conversation_dao.get_or_create(user.id, conversation_id)
-        user_message = self.message_dao.create(conversation.id, "user", message)
+        # A new conversation is inserted with this turn's messages at the final commit,
+        # and has no history to read back yet
+        conversation = self.conversation_dao.get_or_create(user.id, conversation_id, commit=False)
+        if conversation in self.db.new:
+            history = []
+        else:
+            history = self.message_dao.get_recent(conversation.id, HISTORY_LIMIT - 1)
+            # Nothing written yet: end the read transaction so the pooled connection isn't
+            # held idle while the agent waits on Bedrock. Agents that read again check one
+            # out for the rest of the turn.
+            if not (self.db.new or self.db.dirty or self.db.deleted):
+                self.db.commit()
+        # Not flushed: inserted in one batch with the assistant reply at the final commit.
+        # Anything the agents run before then must undo its own failures with a savepoint
+        # (as the plan generators do), never db.rollback(), or this message is lost.
+        # Appended to the history we already hold rather than re-reading it from the DB.
+        user_message = self.message_dao.create(conversation.id, "user", message, commit=False)
+        history.append(user_message)
         if agent_type:
             self._update_agent_if_valid(conversation, agent_type)
 
-        history = self.message_dao.get_by_conversation(conversation.id)
-        # Check if this might be a "confirm" reply: last assistant message was our confirm prompt
-        if (
+        # Replying to our "Reply *yes* to save" prompt? A plain yes saves straight away; anything
+        # else goes to the agent, whose log classifier call also judges whether it confirms
+        confirm_context = (
             conversation.agent_type in (AgentType.NUTRITIONIST, AgentType.TRAINER)
-            and len(history) >= 3
-        ):
-            last_user = history[-1]
-            last_assistant = history[-2]
-            prev_user = history[-3]
-            if (
-                last_user.role == "user"
-                and last_assistant.role == "assistant"
-                and prev_user.role == "user"
-                and (CONFIRM_PROMPT_MARKER in (last_assistant.content or "").lower())
-            ):
-                log_kind = "meal" if conversation.agent_type == AgentType.NUTRITIONIST else "workout"
-                confirmed = await self._llm_user_confirmed_save(
-                    last_assistant.content or "",
-                    last_user.content or "",
-                    log_kind=log_kind
-                )
-                if confirmed:
-                    text_to_parse = (prev_user.content or "").strip()
-                    if text_to_parse:
-                        try:
-                            logged_at = datetime.now(timezone.utc)
-                            if log_kind == "meal":
-                                svc = MealLoggingService(self.db)
-                                parsed = svc.parse_meal(text_to_parse)
-                                confirmed_data = parsed if isinstance(parsed, dict) else {}
-                                svc.save_meal_log(text_to_parse, parsed, confirmed_data, logged_at=logged_at)
-                            else:
-                                svc = WorkoutLoggingService(self.db)
-                                parsed = svc.parse_workout(text_to_parse)
-                                confirmed_data = parsed if isinstance(parsed, dict) else {}
-                                svc.save_workout_log(text_to_parse, parsed, confirmed_data, logged_at=logged_at)
-                            assistant_message = self.message_dao.create(
-                                conversation.id, "assistant", "Saved! Anything else you'd like to log or ask?"
-                            )
-                            return ChatResult(
-                                conversation_id=conversation.id,
-                                user_message=user_message,
-                                assistant_message=assistant_message,
-                                metadata={"agent_type": conversation.agent_type.value}
-                            )
-                        except Exception as e:
-                            assistant_message = self.message_dao.create(
-                                conversation.id, "assistant", f"Something went wrong saving that: {str(e)}. Try describing it again."
-                            )
-                            return ChatResult(
-                                conversation_id=conversation.id,
-                                user_message=user_message,
-                                assistant_message=assistant_message,
-                                metadata={"agent_type": conversation.agent_type.value}
-                            )
+            and awaiting_confirmation(history)
+            and bool((history[-3].content or "").strip())
+        )
+        if confirm_context and CONFIRM_REPLY.fullmatch((message or "").strip().lower()):
+            return self._save_confirmed_log(conversation, user_message, history[-3])
 
         router = AgentRouter(self.db, user.id)
         response = await self._process_with_transitions(
-            router, conversation, message, history
+            router, conversation, message, history, on_delta
         )
+        if confirm_context and response.metadata.get("confirm_previous"):
+            return self._save_confirmed_log(conversation, user_message, history[-3])
         assistant_message = self.message_dao.create(
             conversation.id, "assistant", response.content
         )
@@ -122,12 +99,45 @@ class ChatService:
             metadata=response.metadata
         )
     
+    def _save_confirmed_log(self, conversation, user_message: Message, suggested_from: Message) -> ChatResult:
+        """Re-parse the message the confirmed log was suggested from, save it and reply."""
+        log_kind = "meal" if conversation.agent_type == AgentType.NUTRITIONIST else "workout"
+        text_to_parse = (suggested_from.content or "").strip()
+        try:
+            logged_at = datetime.now(timezone.utc)
+            if log_kind == "meal":
+                svc = MealLoggingService(self.db)
+                parsed = svc.parse_meal(text_to_parse)
+                confirmed_data = parsed if isinstance(parsed, dict) else {}
+                svc.save_meal_log(
+                    text_to_parse, parsed, confirmed_data, logged_at=logged_at, commit=False
+                )
+            else:
+                svc = WorkoutLoggingService(self.db)
+                parsed = svc.parse_workout(text_to_parse)
+                confirmed_data = parsed if isinstance(parsed, dict) else {}
+                svc.save_workout_log(
+                    text_to_parse, parsed, confirmed_data, logged_at=logged_at, commit=False
+                )
+            # Commits the log together with both messages
+            content = "Saved! Anything else you'd like to log or ask?"
+        except Exception as e:
+            content = f"Something went wrong saving that: {str(e)}. Try describing it again."
+        assistant_message = self.message_dao.create(conversation.id, "assistant", content)
+        return ChatResult(
+            conversation_id=conversation.id,
+            user_message=user_message,
+            assistant_message=assistant_message,
+            metadata={"agent_type": conversation.agent_type.value}
+        )
+    
     async def _process_with_transitions(
         self,
         router: AgentRouter,
         conversation,
         message: str,
-        history: List[Message]
+        history: List[Message],
+        on_delta: Optional[Callable[[str], None]] = None
     ) -> AgentResponse:
         """
         Process a message and handle any agent transitions.
@@ -137,13 +147,14 @@ class ChatService:
         """
         # Get current agent and process message
         agent = router.get_agent(conversation.agent_type)
-        response = await agent.process(message, history)
+        response = await agent.process(message, history, on_delta)
         
         # Handle transitions (loop until no more transitions)
         while response.transition:
-            # Update conversation to new agent
+            # Update conversation to new agent; committed with the assistant message, so it
+            # persists even when the greeting below fails (generators roll back a savepoint)
             self.conversation_dao.update_agent_type(
-                conversation, response.transition.target_agent
+                conversation, response.transition.target_agent, commit=False
             )
             
             if response.transition.get_greeting:
@@ -176,39 +187,6 @@ class ChatService:
         try:
             requested_agent = AgentType(agent_type.lower())
             if conversation.agent_type != requested_agent:
-                self.conversation_dao.update_agent_type(conversation, requested_agent)
+                self.conversation_dao.update_agent_type(conversation, requested_agent, commit=False)
         except ValueError:
             pass  # Ignore invalid agent types
-
-    async def _llm_user_confirmed_save(
-        self, last_assistant_content: str, user_reply: str, log_kind: str
-    ) -> bool:
-        """Use low-temp LLM to decide if the user's reply confirms they want to save the suggested log."""
-        schema = {
-            "type": "object",
-            "properties": {"confirmed": {"type": "boolean"}},
-            "required": ["confirmed"],
-        }
-        system = (
-            "You determine whether the user confirmed they want to save a suggested log. "
-            "Reply with JSON only: {\"confirmed\": true} or {\"confirmed\": false}. "
-            "Treat as confirmed if they agree to save (e.g. yes, yep, save it, looks good, correct). "
-            "Treat as not confirmed if they are correcting the log, asking a question, or declining."
-        )
-        content = (
-            f"Assistant had just suggested a {log_kind} and asked the user to confirm. "
-            f"Assistant said:\n{last_assistant_content}\n\nUser replied: {user_reply}\n\n"
-            "Did the user confirm they want to save this log?"
-        )
-        try:
-            bedrock = BedrockService()
-            out = bedrock.invoke_structured(
-                messages=[{"role": "user", "content": content}],
-                output_schema=schema,
-                system_prompt=system,
-                max_tokens=64,
-                temperature=0.1,
-            )
-            return bool(out.get("confirmed"))
-        except Exception:
-            return False
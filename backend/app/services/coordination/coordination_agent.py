@@ -1,16 +1,88 @@
 """Coordination agent for routing users between different agents."""
-from typing import List, Optional
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app.core.database import SessionLocal
 from app.models.message import Message
 from app.models.user_profile import UserProfile
 from app.models.goal import Goal
 from app.models.plan import Plan, PlanType
 from app.models.conversation import AgentType
+from app.dao import UserDAO
 from app.services.bedrock import BedrockService
 from app.services.coordination.coordination_schema import CoordinationResponse
 from app.services.agents import AgentResponse, Transition
 
+logger = logging.getLogger(__name__)
+
+# Generated once; pydantic schema generation is far from free and the model never changes
+_RESPONSE_SCHEMA = CoordinationResponse.model_json_schema(mode='serialization')
+
+# Per-user context block, keyed by user_id. It only changes when the user's profile, goals
+# or plans do: a commit in this process that touches any of those drops the user's entry,
+# so only writes made by other workers can be served stale, and then for at most the TTL.
+_CONTEXT_TTL_SECONDS = 300.0
+_CONTEXT_CACHE_SIZE = 1024
+_context_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_context_cache_lock = threading.Lock()
+# Bumped whenever entries are dropped; a context built while that happened is not stored
+_context_generation = 0
+_CONTEXT_MODELS = (UserProfile, Goal, Plan)
+_CHANGED_USERS_KEY = "coordination_context_changed_users"
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _note_context_changes(session: Session, flush_context) -> None:
+    # new/dirty/deleted still hold what was just flushed at this point
+    changed = [
+        obj.user_id
+        for obj in itertools.chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, _CONTEXT_MODELS)
+    ]
+    if changed:
+        session.info.setdefault(_CHANGED_USERS_KEY, set()).update(changed)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _drop_changed_contexts(session: Session) -> None:
+    global _context_generation
+    changed = session.info.pop(_CHANGED_USERS_KEY, None)
+    if changed:
+        with _context_cache_lock:
+            for user_id in changed:
+                _context_cache.pop(user_id, None)
+            _context_generation += 1
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_context_changes(session: Session) -> None:
+    session.info.pop(_CHANGED_USERS_KEY, None)
+
+
+_GREETING = (
+    "🎉 Great! I have everything I need to create your personalized plans. "
+    "What would you like to do first?\n"
+    "• Generate your meal plan\n"
+    "• Generate your workout plan"
+)
+
+# Fixed wording (our own greeting menu and the prompt's examples) that always maps to
+# the same action, so these skip the LLM: normalized message -> (action, suggested_agent)
+_MENU_ACTIONS = {
+    "generate your meal plan": ("generate_meal_plan", AgentType.NUTRITIONIST.value),
+    "generate my meal plan": ("generate_meal_plan", AgentType.NUTRITIONIST.value),
+    "create my meal plan": ("generate_meal_plan", AgentType.NUTRITIONIST.value),
+    "generate your workout plan": ("generate_workout_plan", AgentType.TRAINER.value),
+    "generate my workout plan": ("generate_workout_plan", AgentType.TRAINER.value),
+    "create my workout plan": ("generate_workout_plan", AgentType.TRAINER.value),
+}
+
 
 class CoordinationAgent:
     """Agent for coordinating user interactions and routing to appropriate agents."""
@@ -18,16 +90,26 @@ class CoordinationAgent:
     @property
     def response_schema(self) -> dict:
         """Get JSON schema from Pydantic model."""
-        return CoordinationResponse.model_json_schema(mode='serialization')
+        return _RESPONSE_SCHEMA
     
     def __init__(self, db: Session, user_id: str, model_id: Optional[str] = None):
         self.db = db
         self.user_id = user_id
         self.bedrock = BedrockService(model_id=model_id)
     
-    async def process(self, message: str, history: List[Message]) -> AgentResponse:
-        """Process a user message and return a response."""
-        response_text, suggested_agent, action = await self._get_llm_response(message, history)
+    async def process(
+        self,
+        message: str,
+        history: List[Message],
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> AgentResponse:
+        """Process a user message and return a response (structured replies are not streamed)."""
+        menu_action = _MENU_ACTIONS.get(message.strip().lower().rstrip(".!"))
+        if menu_action:
+            action, suggested_agent = menu_action
+            response_text = ""
+        else:
+            response_text, suggested_agent, action = await self._get_llm_response(message, history)
         
         metadata = {
             "agent_type": AgentType.COORDINATION.value,
@@ -74,12 +156,7 @@ class CoordinationAgent:
     async def get_greeting(self, context: dict = None) -> AgentResponse:
         """Get the agent's initial greeting."""
         return AgentResponse(
-            content=(
-                "🎉 Great! I have everything I need to create your personalized plans. "
-                "What would you like to do first?\n"
-                "• Generate your meal plan\n"
-                "• Generate your workout plan"
-            ),
+            content=_GREETING,
             metadata={"agent_type": AgentType.COORDINATION.value}
         )
     
@@ -107,10 +184,8 @@ class CoordinationAgent:
                 coordination_response.suggested_agent,
                 coordination_response.action
             )
-        except Exception as e:
-            print(f"Error in coordination agent: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Coordination agent Bedrock call failed")
             return (
                 "I'm having a quick connection hiccup. Ask me again in a moment.",
                 None,
@@ -119,18 +194,53 @@ class CoordinationAgent:
     
     def _build_system_prompt(self) -> str:
         """Build system prompt for coordination agent."""
-        profile = self.db.query(UserProfile).filter(UserProfile.user_id == self.user_id).first()
-        goals = self.db.query(Goal).filter(Goal.user_id == self.user_id, Goal.is_active == True).all()
-        active_meal_plan = self.db.query(Plan).filter(
-            Plan.user_id == self.user_id,
-            Plan.plan_type == PlanType.MEAL,
-            Plan.is_active == True
-        ).first()
-        active_workout_plan = self.db.query(Plan).filter(
-            Plan.user_id == self.user_id,
-            Plan.plan_type == PlanType.WORKOUT,
-            Plan.is_active == True
-        ).first()
+        now = time.monotonic()
+        with _context_cache_lock:
+            cached = _context_cache.get(self.user_id)
+            if cached is not None and now - cached[0] < _CONTEXT_TTL_SECONDS:
+                _context_cache.move_to_end(self.user_id)
+                context = cached[1]
+            else:
+                context = None
+            generation = _context_generation
+        
+        if context is None:
+            context = self._build_user_context()
+            with _context_cache_lock:
+                if generation == _context_generation:
+                    _context_cache[self.user_id] = (now, context)
+                    _context_cache.move_to_end(self.user_id)
+                    if len(_context_cache) > _CONTEXT_CACHE_SIZE:
+                        _context_cache.popitem(last=False)
+        
+        return f"""You are a friendly front desk coordinator for Fitnesse, an AI-driven health and fitness application.
+
+User Context:
+{context}
+
+Available Agents:
+1. **Nutritionist Agent**: Helps users log meals and track nutrition
+2. **Trainer Agent**: Helps users log exercises and track workouts
+
+Guidelines:
+- Be conversational and friendly
+- If user wants to generate a meal plan, use action 'generate_meal_plan'
+- If user wants to generate a workout plan, use action 'generate_workout_plan'
+- If user wants to log meals (and has a meal plan), use action 'route_to_nutritionist'
+- If user wants to log workouts (and has a workout plan), use action 'route_to_trainer'
+- Keep responses concise (2-3 sentences)
+
+Actions:
+- "Create my meal plan" → action: 'generate_meal_plan'
+- "Create my workout plan" → action: 'generate_workout_plan'
+- "Log a meal" → action: 'route_to_nutritionist' (if they have a meal plan)
+- "Log a workout" → action: 'route_to_trainer' (if they have a workout plan)"""
+    
+    def _build_user_context(self) -> str:
+        """Describe the user's profile, active goals and plan status for the prompt."""
+        profile, goals, active_plans = UserDAO(self.db).get_coordination_context(self.user_id)
+        active_meal_plan = active_plans.get(PlanType.MEAL)
+        active_workout_plan = active_plans.get(PlanType.WORKOUT)
         
         context_parts = []
         
@@ -157,11 +267,11 @@ class CoordinationAgent:
         from app.services.nutritionist.planning import MealPlanData
         from app.services.trainer.planning import WorkoutPlanData
         try:
-            has_meal_plan = bool(active_meal_plan and MealPlanData.from_stored(active_meal_plan.plan_data))
+            has_meal_plan = bool(active_meal_plan and MealPlanData.from_plan(active_meal_plan))
         except Exception:
             has_meal_plan = False
         try:
-            has_workout_plan = bool(active_workout_plan and WorkoutPlanData.from_stored(active_workout_plan.plan_data))
+            has_workout_plan = bool(active_workout_plan and WorkoutPlanData.from_plan(active_workout_plan))
         except Exception:
             has_workout_plan = False
         
@@ -175,30 +285,7 @@ class CoordinationAgent:
         else:
             context_parts.append("- ❌ Workout plan: NOT CREATED - user should generate it first")
         
-        context = "\n".join(context_parts) if context_parts else "No user profile or goals yet."
-        
-        return f"""You are a friendly front desk coordinator for Fitnesse, an AI-driven health and fitness application.
-
-User Context:
-{context}
-
-Available Agents:
-1. **Nutritionist Agent**: Helps users log meals and track nutrition
-2. **Trainer Agent**: Helps users log exercises and track workouts
-
-Guidelines:
-- Be conversational and friendly
-- If user wants to generate a meal plan, use action 'generate_meal_plan'
-- If user wants to generate a workout plan, use action 'generate_workout_plan'
-- If user wants to log meals (and has a meal plan), use action 'route_to_nutritionist'
-- If user wants to log workouts (and has a workout plan), use action 'route_to_trainer'
-- Keep responses concise (2-3 sentences)
-
-Actions:
-- "Create my meal plan" → action: 'generate_meal_plan'
-- "Create my workout plan" → action: 'generate_workout_plan'
-- "Log a meal" → action: 'route_to_nutritionist' (if they have a meal plan)
-- "Log a workout" → action: 'route_to_trainer' (if they have a workout plan)"""
+        return "\n".join(context_parts) if context_parts else "No user profile or goals yet."
     
     def _format_messages(self, conversation_history: List[Message]) -> List[dict]:
         """Format conversation history for Bedrock."""
@@ -12,6 +12,8 @@ from app.services.nutritionist.planning import MealPlanData
 from app.services.bedrock import BedrockService
 from app.services.nutritionist.logging.meal_logging_schema import MealParseResult
 
+_PARSE_SCHEMA = MealParseResult.model_json_schema(mode="serialization")
+
 
 class MealLoggingService:
     """Parses and saves meal logs."""
@@ -30,7 +32,7 @@ class MealLoggingService:
                 detail="No active meal plan. Generate a meal plan before logging meals.",
             )
         try:
-            MealPlanData.from_stored(plan.plan_data)  # Validate plan_data is valid
+            MealPlanData.from_plan(plan)  # Validate plan_data is valid
         except Exception:
             raise HTTPException(
                 status_code=400,
@@ -41,7 +43,6 @@ class MealLoggingService:
         user = self.user_dao.get_or_create_temp_user()
         self._require_active_meal_plan(user.id)
 
-        schema = MealParseResult.model_json_schema(mode="serialization")
         system_prompt = (
             "You are a nutritionist assistant. Convert the user's meal description into a structured estimate.\n\n"
             "STRUCTURE:\n"
@@ -61,7 +62,7 @@ class MealLoggingService:
         try:
             result = self.bedrock.invoke_structured(
                 messages=[{"role": "user", "content": text}],
-                output_schema=schema,
+                output_schema=_PARSE_SCHEMA,
                 system_prompt=system_prompt,
                 max_tokens=800,
                 temperature=0.2,
@@ -84,6 +85,7 @@ class MealLoggingService:
         parsed_data: Optional[Dict[str, Any]],
         confirmed_data: Dict[str, Any],
         logged_at: Optional[datetime] = None,
+        commit: bool = True,
     ) -> Log:
         user = self.user_dao.get_or_create_temp_user()
         self._require_active_meal_plan(user.id)
@@ -100,8 +102,8 @@ class MealLoggingService:
             logged_at=logged_at,
         )
         self.db.add(log)
-        self.db.commit()
-        self.db.refresh(log)
+        if commit:
+            self.db.commit()
         return log
 
 
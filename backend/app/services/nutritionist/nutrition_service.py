@@ -36,7 +36,7 @@ class NutritionService:
         existing = self.plan_dao.get_active_plan(user.id, PlanType.MEAL)
         if existing:
             try:
-                MealPlanData.from_stored(existing.plan_data)  # Validate plan exists and is valid
+                MealPlanData.from_plan(existing)  # Validate plan exists and is valid
                 raise HTTPException(
                     status_code=409,
                     detail=f"Active meal plan already exists (plan_id={existing.id}). Use plan update/feedback instead of creating a new plan.",
@@ -50,7 +50,7 @@ class NutritionService:
 
     def get_today_view_for_plan(self, plan: Plan, view_date: date, include_detail: bool = True) -> Dict[str, Any]:
         """Build today's meal view from the plan's canonical data (no fallback logic)."""
-        model = MealPlanData.from_stored(plan.plan_data)
+        model = MealPlanData.from_plan(plan)
         day_num = view_date.weekday() + 1  # 1=Monday .. 7=Sunday
         day_meals = next((d for d in model.weekly_schedule if d.day == day_num), None)
         meals = []
@@ -1,10 +1,19 @@
 """Nutritionist agent for meal tracking and nutrition guidance."""
-from typing import Optional, List, Dict, Any
+import logging
+import re
+from typing import Callable, Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 
 from app.models.conversation import AgentType
 from app.models.message import Message
-from app.services.agents import AgentResponse, Transition
+from app.services.agents import (
+    AgentResponse,
+    Transition,
+    CONFIRM_INSTRUCTION,
+    CONFIRM_PROMPT,
+    awaiting_confirmation,
+    skip_classifier,
+)
 from app.services.nutritionist.planning import MealPlanGenerator
 from app.services.bedrock import BedrockService
 from app.services.nutritionist.logging.meal_logging_service import MealLoggingService
@@ -12,6 +21,39 @@ from app.dao import PlanDAO
 from app.models.plan import PlanType
 from app.services.nutritionist.planning import MealPlanData
 
+logger = logging.getLogger(__name__)
+
+# Phrases that hand the conversation to the trainer, compiled once into a single scan
+_SWITCH_TO_TRAINER = re.compile(r"switch to trainer|talk to trainer|log workout|log exercise")
+
+_LOG_MEAL_SCHEMA = {
+    "type": "object",
+    "properties": {"log_meal": {"type": "boolean"}},
+    "required": ["log_meal"],
+}
+# Used instead when the user is answering our confirm prompt
+_LOG_MEAL_OR_CONFIRM_SCHEMA = {
+    "type": "object",
+    "properties": {"log_meal": {"type": "boolean"}, "confirm_previous": {"type": "boolean"}},
+    "required": ["log_meal", "confirm_previous"],
+}
+
+_MEAL_EXAMPLES = (
+    "What did you eat? You can describe your meal naturally, like:\n"
+    "• \"I had eggs and toast for breakfast\"\n"
+    "• \"Chicken salad with avocado for lunch\"\n"
+    "• \"A protein shake after my workout\""
+)
+_PLAN_READY_GREETING = (
+    "🍽️ Your personalized meal plan is ready!\n\n"
+    "I'm your nutritionist and I'll help you track your meals and nutrition.\n\n"
+    + _MEAL_EXAMPLES
+)
+_GREETING = (
+    "Hi! I'm your nutritionist. I'll help you track your meals and nutrition. 🥗\n\n"
+    + _MEAL_EXAMPLES
+)
+
 
 class NutritionistAgent:
     """Agent for tracking meals and providing nutrition guidance."""
@@ -23,20 +65,36 @@ class NutritionistAgent:
         self.bedrock = BedrockService(model_id=model_id)
         self.plan_dao = PlanDAO(db)
     
-    async def process(self, message: str, history: List[Message]) -> AgentResponse:
-        """Process a user message and return a response."""
+    async def process(
+        self,
+        message: str,
+        history: List[Message],
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> AgentResponse:
+        """Process a user message and return a response, streaming free-text replies to on_delta."""
         lower_msg = message.strip().lower()
         
         # Check if user wants to switch to trainer
-        if any(phrase in lower_msg for phrase in ["switch to trainer", "talk to trainer", "log workout", "log exercise"]):
+        if _SWITCH_TO_TRAINER.search(lower_msg):
             return AgentResponse(
                 content="💪 Switching you to our trainer...",
                 metadata={"agent_type": AgentType.NUTRITIONIST.value},
                 transition=Transition(AgentType.TRAINER, get_greeting=True)
             )
         
-        # In-chat meal logging: use LLM to decide if user is describing a meal they want to log
-        if await self._llm_is_meal_log(message, history):
+        # In-chat meal logging: use LLM to decide if user is describing a meal they want to log,
+        # or, right after our confirm prompt, whether they are confirming the suggested log
+        if skip_classifier(lower_msg, history):
+            verdict = {}
+        else:
+            verdict = await self._llm_classify_message(message, history)
+        if verdict.get("confirm_previous"):
+            # The chat service saves the suggested log and writes the reply
+            return AgentResponse(
+                content="",
+                metadata={"agent_type": AgentType.NUTRITIONIST.value, "confirm_previous": True}
+            )
+        if verdict.get("log_meal"):
             try:
                 meal_svc = MealLoggingService(self.db)
                 parsed = meal_svc.parse_meal(message)
@@ -45,21 +103,26 @@ class NutritionistAgent:
                 if conf >= 0.4 and norm:
                     summary = self._format_meal_summary(parsed)
                     return AgentResponse(
-                        content=f"{summary}\n\nReply *yes* to save, or tell me what to change.",
+                        content=f"{summary}\n\n{CONFIRM_PROMPT}",
                         metadata={"agent_type": AgentType.NUTRITIONIST.value}
                     )
             except Exception:
                 pass  # Fall through to conversational response
-        return await self._get_llm_response(message, history)
+        return await self._get_llm_response(message, history, on_delta)
     
-    async def _get_llm_response(self, message: str, history: List[Message]) -> AgentResponse:
+    async def _get_llm_response(
+        self,
+        message: str,
+        history: List[Message],
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> AgentResponse:
         """Get intelligent response from Bedrock."""
         # Build context about user's meal plan
         meal_plan = self.plan_dao.get_active_plan(self.user_id, PlanType.MEAL)
         plan_context = ""
         if meal_plan:
             try:
-                meal_model = MealPlanData.from_stored(meal_plan.plan_data)
+                meal_model = MealPlanData.from_plan(meal_plan)
                 end_text = f", end: {meal_plan.end_date}" if meal_plan.end_date else " (ongoing)"
                 plan_summary = f"User has an active meal plan (start: {meal_plan.start_date}{end_text}). "
                 if meal_model.daily_calories:
@@ -97,7 +160,8 @@ Keep responses conversational, helpful, and brief (2-3 sentences max). If they'r
                 messages=messages,
                 system_prompt=system_prompt,
                 max_tokens=500,
-                temperature=0.2
+                temperature=0.2,
+                on_delta=on_delta
             )
             
             # Check if response suggests redirecting to trainer - if it includes a link to /training, don't transition
@@ -114,8 +178,8 @@ Keep responses conversational, helpful, and brief (2-3 sentences max). If they'r
                 content=response_text,
                 metadata={"agent_type": AgentType.NUTRITIONIST.value}
             )
-        except Exception as e:
-            print(f"Error in nutritionist agent Bedrock call: {str(e)}")
+        except Exception:
+            logger.exception("Nutritionist agent Bedrock call failed")
             fallback = (
                 "🥗 I'm having a quick connection hiccup. Ask me again in a moment."
             )
@@ -143,18 +207,11 @@ Keep responses conversational, helpful, and brief (2-3 sentences max). If they'r
                 metadata["meal_plan_generated"] = True
                 
                 return AgentResponse(
-                    content=(
-                        "🍽️ Your personalized meal plan is ready!\n\n"
-                        "I'm your nutritionist and I'll help you track your meals and nutrition.\n\n"
-                        "What did you eat? You can describe your meal naturally, like:\n"
-                        "• \"I had eggs and toast for breakfast\"\n"
-                        "• \"Chicken salad with avocado for lunch\"\n"
-                        "• \"A protein shake after my workout\""
-                    ),
+                    content=_PLAN_READY_GREETING,
                     metadata=metadata
                 )
-            except Exception as e:
-                print(f"Error generating meal plan: {str(e)}")
+            except Exception:
+                logger.exception("Meal plan generation failed")
                 return AgentResponse(
                     content=(
                         "I had trouble creating your meal plan. Let's try again - "
@@ -165,29 +222,26 @@ Keep responses conversational, helpful, and brief (2-3 sentences max). If they'r
         
         # Standard greeting (no plan generation)
         return AgentResponse(
-            content=(
-                "Hi! I'm your nutritionist. I'll help you track your meals and nutrition. 🥗\n\n"
-                "What did you eat? You can describe your meal naturally, like:\n"
-                "• \"I had eggs and toast for breakfast\"\n"
-                "• \"Chicken salad with avocado for lunch\"\n"
-                "• \"A protein shake after my workout\""
-            ),
+            content=_GREETING,
             metadata=metadata
         )
 
-    async def _llm_is_meal_log(self, message: str, history: List[Message]) -> bool:
-        """Use low-temp LLM to decide if the user is describing a meal they want to log (vs question/feedback/other)."""
-        schema = {
-            "type": "object",
-            "properties": {"log_meal": {"type": "boolean"}},
-            "required": ["log_meal"],
-        }
+    async def _llm_classify_message(self, message: str, history: List[Message]) -> Dict[str, bool]:
+        """
+        Use low-temp LLM to decide if the user is describing a meal they want to log (vs question/feedback/other).
+        
+        When the user is replying to our confirm prompt, the same call also decides whether the
+        reply confirms saving the suggested log (confirm_previous).
+        """
+        awaiting = awaiting_confirmation(history)
         system = (
             "You determine whether the user is describing a meal or food they just ate and want to log. "
             "Reply with JSON only: {\"log_meal\": true} or {\"log_meal\": false}. "
             "Set log_meal true when they are telling you what they ate (e.g. 'I had chicken salad', 'eggs and toast for breakfast'). "
             "Set log_meal false when they are asking a question, giving feedback about their plan, asking for help, or discussing something else."
         )
+        if awaiting:
+            system += " " + CONFIRM_INSTRUCTION
         recent = ""
         if history:
             for msg in history[-4:]:
@@ -196,14 +250,17 @@ Keep responses conversational, helpful, and brief (2-3 sentences max). If they'r
         try:
             out = self.bedrock.invoke_structured(
                 messages=[{"role": "user", "content": content}],
-                output_schema=schema,
+                output_schema=_LOG_MEAL_OR_CONFIRM_SCHEMA if awaiting else _LOG_MEAL_SCHEMA,
                 system_prompt=system,
                 max_tokens=32,
                 temperature=0.1,
             )
-            return bool(out.get("log_meal"))
+            return {
+                "log_meal": bool(out.get("log_meal")),
+                "confirm_previous": awaiting and bool(out.get("confirm_previous")),
+            }
         except Exception:
-            return False
+            return {}
 
     @staticmethod
     def _format_meal_summary(parsed: Dict[str, Any]) -> str:
@@ -1,8 +1,8 @@
 """Meal plan generation service using AWS Bedrock."""
-import uuid
 from datetime import date
 from sqlalchemy.orm import Session
 
+from app.core.ids import new_id
 from app.models.plan import Plan, PlanType
 from app.models.goal import GoalType
 from app.services.nutritionist.planning.meal_plan_schema import MealPlanData
@@ -87,7 +87,7 @@ Create a detailed, personalized nutrition plan that includes:
         if existing_plan:
             # Validate existing plan_data is valid
             try:
-                MealPlanData.from_stored(existing_plan.plan_data)
+                MealPlanData.from_plan(existing_plan)
             except Exception:
                 # If plan_data is invalid, treat as if no plan exists (will regenerate)
                 pass
@@ -97,7 +97,7 @@ Create a detailed, personalized nutrition plan that includes:
         start_date = date.today()
         
         plan = Plan(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=self.user_id,
             plan_type=PlanType.MEAL,
             name=f"{start_date.strftime('%B %Y')} Plan",
@@ -117,10 +117,12 @@ Create a detailed, personalized nutrition plan that includes:
         Generate a personalized meal plan.
 
         The plan row is only committed after plan_data is successfully
-        generated and validated; on any exception the transaction is
-        rolled back so no empty plan is left in the DB.
+        generated and validated; on any exception the savepoint is rolled
+        back so no empty plan is left in the DB.
         """
-        try:
+        # A savepoint, not a session-wide rollback: the caller's pending work (the chat
+        # turn's conversation, user message and agent switch) must survive a failure here
+        with self.db.begin_nested():
             plan = self._get_or_create_plan(duration_days)
 
             prompt = self._build_prompt()
@@ -140,9 +142,5 @@ Create a detailed, personalized nutrition plan that includes:
             canonical = MealPlanData.model_validate(result)
             plan.plan_data = canonical.model_dump(mode="json")
 
-            self.db.commit()
-            self.db.refresh(plan)
-            return plan
-        except Exception:
-            self.db.rollback()
-            raise
+        self.db.commit()
+        return plan
@@ -10,6 +10,8 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.services.plan_generation.stored_plan_cache import parse_plan_data
+
 
 class MacroEstimate(BaseModel):
     """Structured nutrition information (shared between planning and logging)."""
@@ -87,3 +89,8 @@ class MealPlanData(BaseModel):
     def from_stored(cls, data: Any) -> "MealPlanData":
         """Build from DB plan_data. Expects canonical JSON (raises ValidationError if invalid)."""
         return cls.model_validate(data)
+
+    @classmethod
+    def from_plan(cls, plan: Any) -> "MealPlanData":
+        """Like from_stored(plan.plan_data), cached per plan version; treat the result as read-only."""
+        return parse_plan_data(plan, cls)
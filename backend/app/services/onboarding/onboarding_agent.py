@@ -1,7 +1,7 @@
 """Onboarding agent for conversational data collection."""
+import logging
 import json
-import uuid
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from datetime import date
 from sqlalchemy.orm import Session
 
@@ -13,6 +13,19 @@ from app.services.bedrock import BedrockService
 from app.services.onboarding.onboarding_schema import OnboardingResponse
 from app.services.agents import AgentResponse, Transition
 from app.core.config import settings
+from app.core.ids import new_id
+
+logger = logging.getLogger(__name__)
+
+# Generated once; pydantic schema generation is far from free and the model never changes
+_RESPONSE_SCHEMA = OnboardingResponse.model_json_schema(mode='serialization')
+
+_GREETING = (
+    "Hi! I'm your health assistant. I'm here to help you create a personalized "
+    "fitness and nutrition plan. 👋\n\n"
+    "To get started, could you tell me a bit about yourself? "
+    "What are your main health or fitness goals?"
+)
 
 
 class OnboardingAgent:
@@ -21,7 +34,7 @@ class OnboardingAgent:
     @property
     def response_schema(self) -> Dict[str, Any]:
         """Get JSON schema from Pydantic model."""
-        return OnboardingResponse.model_json_schema(mode='serialization')
+        return _RESPONSE_SCHEMA
     
     def __init__(self, db: Session, user_id: str, model_id: Optional[str] = None):
         self.db = db
@@ -41,8 +54,13 @@ class OnboardingAgent:
         # Build system prompt with context about existing data
         self.system_prompt = self._build_system_prompt()
     
-    async def process(self, message: str, history: List[Message]) -> AgentResponse:
-        """Process a user message and return a response."""
+    async def process(
+        self,
+        message: str,
+        history: List[Message],
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> AgentResponse:
+        """Process a user message and return a response (structured replies are not streamed)."""
         response_text, is_complete = await self._get_llm_response(message, history)
         
         metadata = {"agent_type": AgentType.ONBOARDING.value}
@@ -60,12 +78,7 @@ class OnboardingAgent:
     async def get_greeting(self, context: dict = None) -> AgentResponse:
         """Get the agent's initial greeting."""
         return AgentResponse(
-            content=(
-                "Hi! I'm your health assistant. I'm here to help you create a personalized "
-                "fitness and nutrition plan. 👋\n\n"
-                "To get started, could you tell me a bit about yourself? "
-                "What are your main health or fitness goals?"
-            ),
+            content=_GREETING,
             metadata={"agent_type": AgentType.ONBOARDING.value}
         )
     
@@ -98,7 +111,7 @@ class OnboardingAgent:
                 is_complete = parsed_response.is_complete
                 extracted_data = parsed_response.extracted_data.model_dump(exclude_none=True) if parsed_response.extracted_data else None
             except Exception as e:
-                print(f"Warning: Response validation failed: {str(e)}")
+                logger.warning("Onboarding response validation failed: %s", e)
                 conversation_response = response_data.get("response", "")
                 is_complete = response_data.get("is_complete", False)
                 extracted_data = response_data.get("extracted_data")
@@ -107,13 +120,13 @@ class OnboardingAgent:
             if extracted_data:
                 try:
                     self._save_extracted_data(extracted_data)
-                except Exception as e:
-                    print(f"Error saving extracted data: {str(e)}")
+                except Exception:
+                    logger.exception("Saving onboarding extracted data failed")
             
             return conversation_response, is_complete
         
-        except Exception as e:
-            print(f"Error in Bedrock invocation: {str(e)}")
+        except Exception:
+            logger.exception("Onboarding agent Bedrock call failed")
             return "I'm having a quick connection hiccup. Ask me again in a moment.", False
     
     def _build_system_prompt(self) -> str:
@@ -213,7 +226,7 @@ COMPLETION DETECTION:
         profile = self.existing_profile
         if not profile:
             profile = UserProfile(
-                id=str(uuid.uuid4()),
+                id=new_id(),
                 user_id=self.user_id
             )
             self.db.add(profile)
@@ -282,7 +295,7 @@ COMPLETION DETECTION:
                             pass
                     
                     new_goal = Goal(
-                        id=str(uuid.uuid4()),
+                        id=new_id(),
                         user_id=self.user_id,
                         goal_type=goal_type,
                         description=goal_data.get("description", ""),
@@ -301,5 +314,4 @@ COMPLETION DETECTION:
                     existing_goal.is_active = False
         
         self.db.commit()
-        self.db.refresh(profile)
         self.existing_profile = profile
@@ -0,0 +1,39 @@
+"""Process-wide cache of validated plan_data models."""
+import threading
+from collections import OrderedDict
+from typing import Any, Type, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+# Keyed by (model class, plan id, updated_at). A plan's data is written together with its
+# row, and any later write bumps updated_at, so an entry is never served stale.
+_CACHE_SIZE = 256
+_cache: "OrderedDict[tuple, BaseModel]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def parse_plan_data(plan: Any, model_cls: Type[M]) -> M:
+    """
+    Validate plan.plan_data into model_cls, reusing the result for the same plan version.
+
+    The returned model is shared between requests and must be treated as read-only.
+    Invalid data raises ValidationError and is not cached.
+    """
+    if plan.updated_at is None:  # pending, not yet written
+        return model_cls.model_validate(plan.plan_data)
+
+    key = (model_cls, plan.id, plan.updated_at)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    model = model_cls.model_validate(plan.plan_data)
+    with _cache_lock:
+        _cache[key] = model
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return model
@@ -1,11 +1,14 @@
 """Service for returning application state to the frontend."""
 from typing import Optional
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
 
-from app.dao import UserDAO, PlanDAO, GoalDAO, UserProfileDAO
+from app.dao import UserDAO, PlanDAO
 from app.api.schemas.state import AppStateResponse, SectionState, PlanSummary
 from app.models.plan import PlanType
+from app.models.goal import Goal
 from app.models.log import Log, LogType
+from app.models.user_profile import UserProfile
 from app.services.nutritionist.planning import MealPlanData
 from app.services.trainer.planning import WorkoutPlanData
 
@@ -17,25 +20,29 @@ class StateService:
         self.db = db
         self.user_dao = UserDAO(db)
         self.plan_dao = PlanDAO(db)
-        self.goal_dao = GoalDAO(db)
-        self.profile_dao = UserProfileDAO(db)
 
     def get_state(self) -> AppStateResponse:
         user = self.user_dao.get_or_create_temp_user()
 
-        profile = self.profile_dao.get_by_user_id(user.id)
-        goals = self.goal_dao.get_active_goals(user.id)
-        active_meal_plan = self.plan_dao.get_active_plan(user.id, PlanType.MEAL)
-        active_workout_plan = self.plan_dao.get_active_plan(user.id, PlanType.WORKOUT)
+        # Active goals with a has-profile flag on each row, in one statement. Onboarding
+        # needs both, so with no goal rows it is incomplete whatever the profile says.
+        has_profile = exists().where(UserProfile.user_id == user.id)
+        goal_rows = self.db.execute(
+            select(Goal, has_profile).where(Goal.user_id == user.id, Goal.is_active == True)  # noqa: E712
+        ).all()
+        goals = [goal for goal, _ in goal_rows]
+        onboarding_complete = bool(goal_rows) and bool(goal_rows[0][1])
 
-        onboarding_complete = bool(goals) and bool(profile)
+        active_plans = self.plan_dao.get_active_plans(user.id)
+        active_meal_plan = active_plans.get(PlanType.MEAL)
+        active_workout_plan = active_plans.get(PlanType.WORKOUT)
 
         # Load plan models (ValidationError => treat as no plan)
         # Gracefully handle invalid plan_data by treating as no plan
         meal_model = None
         if active_meal_plan:
             try:
-                meal_model = MealPlanData.from_stored(active_meal_plan.plan_data)
+                meal_model = MealPlanData.from_plan(active_meal_plan)
             except Exception:
                 # Invalid plan_data - treat as if no plan exists
                 pass
@@ -43,7 +50,7 @@ class StateService:
         workout_model = None
         if active_workout_plan:
             try:
-                workout_model = WorkoutPlanData.from_stored(active_workout_plan.plan_data)
+                workout_model = WorkoutPlanData.from_plan(active_workout_plan)
             except Exception:
                 # Invalid plan_data - treat as if no plan exists
                 pass
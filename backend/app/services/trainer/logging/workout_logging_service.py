@@ -12,6 +12,8 @@ from app.services.trainer.planning import WorkoutPlanData
 from app.services.bedrock import BedrockService
 from app.services.trainer.logging.workout_logging_schema import WorkoutParseResult
 
+_PARSE_SCHEMA = WorkoutParseResult.model_json_schema(mode="serialization")
+
 
 class WorkoutLoggingService:
     """Parses and saves workout logs."""
@@ -30,7 +32,7 @@ class WorkoutLoggingService:
                 detail="No active workout plan. Generate a workout plan before logging workouts.",
             )
         try:
-            WorkoutPlanData.from_stored(plan.plan_data)  # Validate plan_data is valid
+            WorkoutPlanData.from_plan(plan)  # Validate plan_data is valid
         except Exception:
             raise HTTPException(
                 status_code=400,
@@ -41,7 +43,6 @@ class WorkoutLoggingService:
         user = self.user_dao.get_or_create_temp_user()
         self._require_active_workout_plan(user.id)
 
-        schema = WorkoutParseResult.model_json_schema(mode="serialization")
         system_prompt = (
             "You are a personal trainer assistant. Parse the user's workout description into structured data.\n\n"
             "EXERCISES: Extract every exercise. Each exercise MUST have an 'exercise_type' and the required fields for that type:\n"
@@ -58,7 +59,7 @@ class WorkoutLoggingService:
         try:
             result = self.bedrock.invoke_structured(
                 messages=[{"role": "user", "content": text}],
-                output_schema=schema,
+                output_schema=_PARSE_SCHEMA,
                 system_prompt=system_prompt,
                 max_tokens=1200,
                 temperature=0.2,
@@ -81,6 +82,7 @@ class WorkoutLoggingService:
         parsed_data: Optional[Dict[str, Any]],
         confirmed_data: Dict[str, Any],
         logged_at: Optional[datetime] = None,
+        commit: bool = True,
     ) -> Log:
         user = self.user_dao.get_or_create_temp_user()
         self._require_active_workout_plan(user.id)
@@ -97,6 +99,6 @@ class WorkoutLoggingService:
             logged_at=logged_at,
         )
         self.db.add(log)
-        self.db.commit()
-        self.db.refresh(log)
+        if commit:
+            self.db.commit()
         return log
@@ -1,9 +1,9 @@
 """Workout plan generation service using AWS Bedrock."""
-import uuid
 from datetime import date
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from app.core.ids import new_id
 from app.core.logging import log_function_call
 from app.models.plan import Plan, PlanType
 from app.models.goal import GoalType
@@ -116,7 +116,7 @@ Create a detailed, personalized workout plan that includes:
         if existing_plan:
             # Validate existing plan_data is valid
             try:
-                WorkoutPlanData.from_stored(existing_plan.plan_data)
+                WorkoutPlanData.from_plan(existing_plan)
             except Exception:
                 # If plan_data is invalid, treat as if no plan exists (will regenerate)
                 pass
@@ -126,7 +126,7 @@ Create a detailed, personalized workout plan that includes:
         start_date = date.today()
         
         plan = Plan(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=self.user_id,
             plan_type=PlanType.WORKOUT,
             name=f"{start_date.strftime('%B %Y')} Plan",
@@ -150,10 +150,12 @@ Create a detailed, personalized workout plan that includes:
         the workout plan is coordinated with nutrition.
 
         The plan row is only committed after plan_data is successfully
-        generated and validated; on any exception the transaction is
-        rolled back so no empty plan is left in the DB.
+        generated and validated; on any exception the savepoint is rolled
+        back so no empty plan is left in the DB.
         """
-        try:
+        # A savepoint, not a session-wide rollback: the caller's pending work (the chat
+        # turn's conversation, user message and agent switch) must survive a failure here
+        with self.db.begin_nested():
             plan = self._get_or_create_plan(duration_days)
 
             # Get existing meal plan (separate plan type) for context if available
@@ -165,7 +167,7 @@ Create a detailed, personalized workout plan that includes:
             ).first()
             if meal_plan:
                 try:
-                    existing_meal_plan = MealPlanData.from_stored(meal_plan.plan_data)
+                    existing_meal_plan = MealPlanData.from_plan(meal_plan)
                 except Exception:
                     pass
 
@@ -186,9 +188,5 @@ Create a detailed, personalized workout plan that includes:
             canonical = WorkoutPlanData.model_validate(result)
             plan.plan_data = canonical.model_dump(mode="json")
 
-            self.db.commit()
-            self.db.refresh(plan)
-            return plan
-        except Exception:
-            self.db.rollback()
-            raise
+        self.db.commit()
+        return plan
@@ -9,6 +9,8 @@ from typing import Any, Dict, List, Optional, Literal, Union, Annotated
 
 from pydantic import BaseModel, Field, Discriminator
 
+from app.services.plan_generation.stored_plan_cache import parse_plan_data
+
 
 class StrengthExerciseDetail(BaseModel):
     """Details for a strength training exercise."""
@@ -68,3 +70,8 @@ class WorkoutPlanData(BaseModel):
     def from_stored(cls, data: Any) -> "WorkoutPlanData":
         """Build from DB plan_data. Expects canonical JSON (raises ValidationError if invalid)."""
         return cls.model_validate(data)
+
+    @classmethod
+    def from_plan(cls, plan: Any) -> "WorkoutPlanData":
+        """Like from_stored(plan.plan_data), cached per plan version; treat the result as read-only."""
+        return parse_plan_data(plan, cls)
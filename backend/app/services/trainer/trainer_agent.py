@@ -1,16 +1,59 @@
 """Trainer agent for workout tracking and fitness guidance."""
-from typing import Optional, List, Dict, Any
+import logging
+import re
+from typing import Callable, Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 
 from app.models.conversation import AgentType
 from app.models.message import Message
-from app.services.agents import AgentResponse, Transition
+from app.services.agents import (
+    AgentResponse,
+    Transition,
+    CONFIRM_INSTRUCTION,
+    CONFIRM_PROMPT,
+    awaiting_confirmation,
+    skip_classifier,
+)
 from app.services.trainer.planning import WorkoutPlanGenerator, WorkoutPlanData
 from app.services.bedrock import BedrockService
 from app.services.trainer.logging.workout_logging_service import WorkoutLoggingService
 from app.dao import PlanDAO
 from app.models.plan import PlanType
 
+logger = logging.getLogger(__name__)
+
+# Phrases that hand the conversation to the nutritionist, compiled once into a single scan
+_SWITCH_TO_NUTRITIONIST = re.compile(r"switch to nutritionist|talk to nutritionist|log meal|log food")
+
+_LOG_WORKOUT_SCHEMA = {
+    "type": "object",
+    "properties": {"log_workout": {"type": "boolean"}},
+    "required": ["log_workout"],
+}
+# Used instead when the user is answering our confirm prompt
+_LOG_WORKOUT_OR_CONFIRM_SCHEMA = {
+    "type": "object",
+    "properties": {"log_workout": {"type": "boolean"}, "confirm_previous": {"type": "boolean"}},
+    "required": ["log_workout", "confirm_previous"],
+}
+
+_WORKOUT_EXAMPLES = (
+    "What did you do today? Describe your workout naturally, like:\n"
+    "• \"30 minutes on the treadmill\"\n"
+    "• \"Chest and back day - bench press, rows, pullups\"\n"
+    "• \"Yoga for 45 minutes\"\n"
+    "• \"10,000 steps today\""
+)
+_PLAN_READY_GREETING = (
+    "💪 Your personalized workout plan is ready!\n\n"
+    "I'm your personal trainer and I'll help you track your workouts.\n\n"
+    + _WORKOUT_EXAMPLES
+)
+_GREETING = (
+    "Hey! I'm your personal trainer. Let's track your workouts! 💪\n\n"
+    + _WORKOUT_EXAMPLES
+)
+
 
 class TrainerAgent:
     """Agent for tracking workouts and providing fitness guidance."""
@@ -22,20 +65,36 @@ class TrainerAgent:
         self.bedrock = BedrockService(model_id=model_id)
         self.plan_dao = PlanDAO(db)
     
-    async def process(self, message: str, history: List[Message]) -> AgentResponse:
-        """Process a user message and return a response."""
+    async def process(
+        self,
+        message: str,
+        history: List[Message],
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> AgentResponse:
+        """Process a user message and return a response, streaming free-text replies to on_delta."""
         lower_msg = message.strip().lower()
         
         # Check if user wants to switch to nutritionist
-        if any(phrase in lower_msg for phrase in ["switch to nutritionist", "talk to nutritionist", "log meal", "log food"]):
+        if _SWITCH_TO_NUTRITIONIST.search(lower_msg):
             return AgentResponse(
                 content="🥗 Switching you to our nutritionist...",
                 metadata={"agent_type": AgentType.TRAINER.value},
                 transition=Transition(AgentType.NUTRITIONIST, get_greeting=True)
             )
         
-        # In-chat workout logging: use LLM to decide if user is describing a workout they want to log
-        if await self._llm_is_workout_log(message, history):
+        # In-chat workout logging: use LLM to decide if user is describing a workout they want to log,
+        # or, right after our confirm prompt, whether they are confirming the suggested log
+        if skip_classifier(lower_msg, history):
+            verdict = {}
+        else:
+            verdict = await self._llm_classify_message(message, history)
+        if verdict.get("confirm_previous"):
+            # The chat service saves the suggested log and writes the reply
+            return AgentResponse(
+                content="",
+                metadata={"agent_type": AgentType.TRAINER.value, "confirm_previous": True}
+            )
+        if verdict.get("log_workout"):
             try:
                 workout_svc = WorkoutLoggingService(self.db)
                 parsed = workout_svc.parse_workout(message)
@@ -44,21 +103,26 @@ class TrainerAgent:
                 if conf >= 0.4 and norm:
                     summary = self._format_workout_summary(parsed)
                     return AgentResponse(
-                        content=f"{summary}\n\nReply *yes* to save, or tell me what to change.",
+                        content=f"{summary}\n\n{CONFIRM_PROMPT}",
                         metadata={"agent_type": AgentType.TRAINER.value}
                     )
             except Exception:
                 pass  # Fall through to conversational response
-        return await self._get_llm_response(message, history)
+        return await self._get_llm_response(message, history, on_delta)
     
-    async def _get_llm_response(self, message: str, history: List[Message]) -> AgentResponse:
+    async def _get_llm_response(
+        self,
+        message: str,
+        history: List[Message],
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> AgentResponse:
         """Get intelligent response from Bedrock."""
         # Build context about user's workout plan so the LLM can reference it
         workout_plan = self.plan_dao.get_active_plan(self.user_id, PlanType.WORKOUT)
         plan_context = ""
         if workout_plan:
             try:
-                workout_model = WorkoutPlanData.from_stored(workout_plan.plan_data)
+                workout_model = WorkoutPlanData.from_plan(workout_plan)
                 end_text = f", end: {workout_plan.end_date}" if workout_plan.end_date else " (ongoing)"
                 parts = [f"User has an active workout plan (start: {workout_plan.start_date}{end_text})."]
                 if workout_model.workouts_per_week is not None:
@@ -92,7 +156,8 @@ Keep responses to 2-4 sentences. Be conversational and useful."""
                 messages=messages,
                 system_prompt=system_prompt,
                 max_tokens=500,
-                temperature=0.2
+                temperature=0.2,
+                on_delta=on_delta
             )
             
             # Check if response suggests redirecting to nutritionist - if it includes a link to /nutrition, don't transition
@@ -109,8 +174,8 @@ Keep responses to 2-4 sentences. Be conversational and useful."""
                 content=response_text,
                 metadata={"agent_type": AgentType.TRAINER.value}
             )
-        except Exception as e:
-            print(f"Error in trainer agent Bedrock call: {str(e)}")
+        except Exception:
+            logger.exception("Trainer agent Bedrock call failed")
             # Contextual fallback so the user still gets a useful reply
             lower = (message or "").strip().lower()
             fallback = (
@@ -140,19 +205,11 @@ Keep responses to 2-4 sentences. Be conversational and useful."""
                 metadata["workout_plan_generated"] = True
                 
                 return AgentResponse(
-                    content=(
-                        "💪 Your personalized workout plan is ready!\n\n"
-                        "I'm your personal trainer and I'll help you track your workouts.\n\n"
-                        "What did you do today? Describe your workout naturally, like:\n"
-                        "• \"30 minutes on the treadmill\"\n"
-                        "• \"Chest and back day - bench press, rows, pullups\"\n"
-                        "• \"Yoga for 45 minutes\"\n"
-                        "• \"10,000 steps today\""
-                    ),
+                    content=_PLAN_READY_GREETING,
                     metadata=metadata
                 )
-            except Exception as e:
-                print(f"Error generating workout plan: {str(e)}")
+            except Exception:
+                logger.exception("Workout plan generation failed")
                 return AgentResponse(
                     content=(
                         "I had trouble creating your workout plan. Let's try again - "
@@ -163,30 +220,26 @@ Keep responses to 2-4 sentences. Be conversational and useful."""
         
         # Standard greeting (no plan generation)
         return AgentResponse(
-            content=(
-                "Hey! I'm your personal trainer. Let's track your workouts! 💪\n\n"
-                "What did you do today? Describe your workout naturally, like:\n"
-                "• \"30 minutes on the treadmill\"\n"
-                "• \"Chest and back day - bench press, rows, pullups\"\n"
-                "• \"Yoga for 45 minutes\"\n"
-                "• \"10,000 steps today\""
-            ),
+            content=_GREETING,
             metadata=metadata
         )
 
-    async def _llm_is_workout_log(self, message: str, history: List[Message]) -> bool:
-        """Use low-temp LLM to decide if the user is describing a workout they want to log (vs question/feedback/other)."""
-        schema = {
-            "type": "object",
-            "properties": {"log_workout": {"type": "boolean"}},
-            "required": ["log_workout"],
-        }
+    async def _llm_classify_message(self, message: str, history: List[Message]) -> Dict[str, bool]:
+        """
+        Use low-temp LLM to decide if the user is describing a workout they want to log (vs question/feedback/other).
+        
+        When the user is replying to our confirm prompt, the same call also decides whether the
+        reply confirms saving the suggested log (confirm_previous).
+        """
+        awaiting = awaiting_confirmation(history)
         system = (
             "You determine whether the user is describing a workout or exercise they just did and want to log. "
             "Reply with JSON only: {\"log_workout\": true} or {\"log_workout\": false}. "
             "Set log_workout true when they are telling you what they did (e.g. '30 min run', 'bench 3x8', 'yoga for 45 min'). "
             "Set log_workout false when they are asking a question, giving feedback about their plan, asking for help, or discussing something else."
         )
+        if awaiting:
+            system += " " + CONFIRM_INSTRUCTION
         recent = ""
         if history:
             for msg in history[-4:]:
@@ -195,14 +248,17 @@ Keep responses to 2-4 sentences. Be conversational and useful."""
         try:
             out = self.bedrock.invoke_structured(
                 messages=[{"role": "user", "content": content}],
-                output_schema=schema,
+                output_schema=_LOG_WORKOUT_OR_CONFIRM_SCHEMA if awaiting else _LOG_WORKOUT_SCHEMA,
                 system_prompt=system,
                 max_tokens=32,
                 temperature=0.1,
             )
-            return bool(out.get("log_workout"))
+            return {
+                "log_workout": bool(out.get("log_workout")),
+                "confirm_previous": awaiting and bool(out.get("confirm_previous")),
+            }
         except Exception:
-            return False
+            return {}
 
     @staticmethod
     def _format_workout_summary(parsed: Dict[str, Any]) -> str:
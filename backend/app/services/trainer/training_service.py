@@ -40,7 +40,7 @@ class TrainingService:
         existing = self.plan_dao.get_active_plan(user.id, PlanType.WORKOUT)
         if existing:
             try:
-                WorkoutPlanData.from_stored(existing.plan_data)  # Validate plan exists and is valid
+                WorkoutPlanData.from_plan(existing)  # Validate plan exists and is valid
                 raise HTTPException(
                     status_code=409,
                     detail=f"Active workout plan already exists (plan_id={existing.id}). Use plan update/feedback instead of creating a new plan.",
@@ -55,7 +55,7 @@ class TrainingService:
     @log_function_call()
     def get_today_view_for_plan(self, plan: Plan, view_date: date, include_detail: bool = True) -> Dict[str, Any]:
         """Build today's workout view from the plan's canonical data (no fallback logic)."""
-        model = WorkoutPlanData.from_stored(plan.plan_data)
+        model = WorkoutPlanData.from_plan(plan)
         day_num = view_date.weekday() + 1  # 1=Monday .. 7=Sunday
         day_workout = next((d for d in model.weekly_schedule if d.day == day_num), None)
 